@@ -0,0 +1,145 @@
+#analysis.py
+"""
+Created on Sat Oct 24 16:20:05 2026
+
+Description:批量局面分析。逐个读入局面（按顺序的落子位置，黑白交替，黑方先行），
+产出轮到落子一方视角下整盘的落子优先级和最佳落子点，不经过界面。分析结果按局面的
+Zobrist哈希缓存在定长的LRU缓存中；相邻局面共同的前几步不重新落子，只撤销和补上
+不同的部分，逐局按顺序分析对局记录时每个局面只需落一子
+
+用法：python analysis.py games.gbr --output analysis.jsonl
+"""
+import argparse
+import collections
+import json
+import sys
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from machine import Machine
+from record import readRecords
+
+# 一个局面的分析结果：局面哈希、轮到落子一方视角下按[y][x]索引的落子优先级
+# （已有棋子的点为0）、最佳落子点
+Analysis = collections.namedtuple("Analysis", ["Hash", "Scores", "Best"])
+
+class Analyzer:
+    # 初始化，cacheSize为缓存的局面数，rule为规则变体（见rules.py），默认为无禁手
+    def __init__(self, pointNumber, cacheSize=100000, rule=None):
+        self._pointNumber = pointNumber
+        self._board = Board(pointNumber, rule)
+        # 双方视角下的机器，与分析用的棋盘共用，随之更新缓存的权重
+        self._views = {chessMan.Value: Machine(pointNumber, chessMan, threatNodes=0,
+                                               board=self._board)
+                       for chessMan in (BLACK_CHESSMAN, WHITE_CHESSMAN)}
+        self._rule = self._board.rule
+        self._cache = collections.OrderedDict() # 局面哈希 -> 分析结果，按最近使用排序
+        self._cacheSize = cacheSize
+        self.hits = 0 # 缓存命中次数
+        self.misses = 0 # 缓存未命中次数
+
+    # 将分析用的棋盘摆成moves对应的局面：撤销与当前局面不同的落子，再补上其余的落子
+    def _setPosition(self, moves):
+        current = self._board.moves
+        common = 0
+        while common < len(current) and common < len(moves) \
+            and current[common] == moves[common]:
+            common += 1
+        while len(current) > common:
+            self._board.unmakeMove()
+        for index in range(common, len(moves)):
+            if index % 2 == 0:
+                value = BLACK_CHESSMAN.Value
+            else:
+                value = WHITE_CHESSMAN.Value
+            self._board.makeMove(moves[index], value)
+
+    # 分析当前局面：轮到落子一方视角下的整盘优先级，取优先级最高的空位（有禁手的
+    # 规则中去掉禁手点），优先级相同时取先按行后按列最靠前的点；空棋盘时为天元。
+    # 优先级读取机器随落子增量更新的缓存，不重新计算整盘
+    def _evaluate(self):
+        if len(self._board.moves) % 2 == 0:
+            value = BLACK_CHESSMAN.Value
+        else:
+            value = WHITE_CHESSMAN.Value
+        view = self._views[value]
+        bits = self._board.bits
+        scores = []
+        best = None
+        bestScore = 0
+        for y in range(self._pointNumber):
+            scoreRow = []
+            for x in range(self._pointNumber):
+                if not bits.isEmpty(x, y):
+                    score = 0
+                else:
+                    point = Point(x, y)
+                    score = view.getCachedScore(point)
+                    if score > bestScore and not (self._rule.hasForbidden
+                                                  and view.isForbidden(point)):
+                        best = point
+                        bestScore = score
+                scoreRow.append(score)
+            scores.append(tuple(scoreRow))
+        if best is None:
+            center = self._pointNumber // 2
+            best = Point(center, center)
+        return tuple(scores), best
+
+    # 分析一个局面，moves为按顺序的落子位置（Point或(x, y)），返回Analysis；
+    # 返回的结果可能来自缓存，不应修改
+    def analyze(self, moves):
+        self._setPosition([Point(*point) for point in moves])
+        key = self._board.hash
+        result = self._cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return result
+        self.misses += 1
+        result = Analysis(key, *self._evaluate())
+        self._cache[key] = result
+        if len(self._cache) > self._cacheSize:
+            self._cache.popitem(last=False) # 淘汰最久未使用的局面
+        return result
+
+    # 逐个分析positions中的局面，逐个产出结果，不需要一次读入所有局面
+    def analyzeAll(self, positions):
+        for moves in positions:
+            yield self.analyze(moves)
+
+    # 依次分析一局棋谱中每步落子前的局面，产出(步数, 结果)
+    def analyzeGame(self, moves):
+        for ply in range(len(moves)):
+            yield ply, self.analyze(moves[:ply])
+
+def main():
+    parser = argparse.ArgumentParser(description="五子棋棋谱的批量局面分析")
+    parser.add_argument("records", nargs="+", help="二进制棋谱文件（见record.py）")
+    parser.add_argument("--output", help="逐局面结果的输出文件（JSON行），默认输出到标准输出")
+    parser.add_argument("--cache-size", type=int, default=100000, help="缓存的局面数")
+    parser.add_argument("--scores", action="store_true", help="输出整盘的落子优先级")
+    args = parser.parse_args()
+
+    analyzers = {} # 各棋盘大小的分析器
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        game = 0
+        for path in args.records:
+            for record in readRecords(path):
+                if record.Size not in analyzers:
+                    analyzers[record.Size] = Analyzer(record.Size, args.cache_size)
+                for ply, result in analyzers[record.Size].analyzeGame(record.Moves):
+                    line = {"game": game, "ply": ply, "best": [result.Best.X, result.Best.Y],
+                            "played": [record.Moves[ply].X, record.Moves[ply].Y]}
+                    if args.scores:
+                        line["scores"] = result.Scores
+                    output.write(json.dumps(line) + "\n")
+                game += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    hits = sum(analyzer.hits for analyzer in analyzers.values())
+    misses = sum(analyzer.misses for analyzer in analyzers.values())
+    print(f"共分析{hits + misses}个局面，缓存命中{hits}次", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
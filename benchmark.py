@@ -0,0 +1,205 @@
+#benchmark.py
+"""
+Created on Tue Oct 20 15:40:18 2026
+
+Description:落子、局面评估和胜负判断的基准测试。在由固定种子自对弈截取的开局、中局、残局局面上
+测量Board.win、Board.countDirection、Machine.getPointScore和Machine.machineDrop
+每次调用的耗时分位数及每秒次数，可并列比较多个引擎并与保存的结果对比
+
+用法：python benchmark.py --engines machine search --output bench.json
+      python benchmark.py --baseline bench.json --max-regression 0.2
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point, offset
+from engines import ENGINES, createEngine
+from machine import Machine
+
+# 基准局面：名称 -> (随机数种子, 棋子数)
+POSITIONS = {"opening": (1, 4),
+             "midgame": (2, 20),
+             "endgame": (3, 40)}
+
+# 生成固定的局面：以seed为种子在天元附近随机摆opening子后，双方用不做威胁空间搜索的
+# 机器自对弈，截取前stones步；对局在截取处之后margin步内结束（局面中已有必胜点）时
+# 换下一个种子重下，返回按落子顺序排列的(棋子, 位置)
+def makePosition(pointNumber, stones, seed, opening=3, margin=4):
+    while True:
+        generator = random.Random(seed)
+        random.seed(seed) # 机器在权重相同的点中随机选择，同样固定种子保证局面不变
+        board = Board(pointNumber)
+        machines = {chessMan.Value: Machine(pointNumber, chessMan, threatNodes=0, board=board)
+                    for chessMan in (BLACK_CHESSMAN, WHITE_CHESSMAN)}
+        center = pointNumber // 2
+        moves = []
+        runner = BLACK_CHESSMAN
+        while len(moves) < stones + margin:
+            if len(moves) < opening:
+                point = Point(center + generator.randint(-2, 2), center + generator.randint(-2, 2))
+                if not board.ifDropChess(point):
+                    continue
+            else:
+                point = machines[runner.Value].machineDrop()
+                if point is None: # 棋盘已下满
+                    break
+            board.makeMove(point, runner.Value)
+            moves.append((runner, point))
+            if board.win(point):
+                break
+            runner = WHITE_CHESSMAN if runner == BLACK_CHESSMAN else BLACK_CHESSMAN
+        else:
+            return moves[:stones]
+        seed += len(POSITIONS) # 不与其他局面的种子重复
+
+# 多次调用function测量每次的耗时（秒），argsList为每次调用的参数
+def measure(function, argsList, rounds):
+    samples = []
+    for i in range(rounds):
+        for args in argsList:
+            start = time.perf_counter()
+            function(*args)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+# 汇总耗时：分位数以微秒为单位
+def summarize(samples):
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    mean = statistics.fmean(samples)
+    return {"calls": len(samples),
+            "p50": percentiles[49] * 1e6,
+            "p90": percentiles[89] * 1e6,
+            "p99": percentiles[98] * 1e6,
+            "mean": mean * 1e6,
+            "perSecond": 1 / mean if mean > 0 else 0.0}
+
+# 棋盘规则部分的基准测试
+def benchmarkBoard(moves, pointNumber, rounds):
+    board = Board(pointNumber)
+    for chessMan, point in moves:
+        board.bits.place(chessMan.Value, point.X, point.Y)
+    stones = [(point,) for chessMan, point in moves]
+    directions = [(point, chessMan.Value, offsetX, offsetY)
+                  for chessMan, point in moves for offsetX, offsetY in offset]
+    return {"Board.win": summarize(measure(board.win, stones, rounds)),
+            "Board.countDirection": summarize(measure(board.countDirection,
+                                                      directions, rounds))}
+
+# 引擎部分的基准测试，引擎执轮到落子的一方
+def benchmarkEngine(name, moves, pointNumber, rounds, options):
+    runner = BLACK_CHESSMAN if len(moves) % 2 == 0 else WHITE_CHESSMAN
+    engine = createEngine(name, pointNumber, runner, **options)
+    for chessMan, point in moves:
+        engine.makeMove(point, chessMan.Value)
+    occupied = {point for chessMan, point in moves}
+    empties = [(Point(x, y),) for x in range(pointNumber) for y in range(pointNumber)
+               if Point(x, y) not in occupied]
+
+    # 落子后撤销，保持局面不变（测得的耗时包含撤销落子），无处可下时没有落子
+    def dropAndUndo():
+        point = engine.machineDrop()
+        if point is not None:
+            engine.unmakeMove(point)
+
+    random.seed(0)
+    try:
+        return {"Machine.getPointScore": summarize(measure(engine.getPointScore,
+                                                           empties, rounds)),
+                "Machine.machineDrop": summarize(measure(dropAndUndo, [()], rounds))}
+    finally:
+        close = getattr(engine, "close", None) # 关闭引擎的进程池
+        if close is not None:
+            close()
+
+# 运行全部基准测试，返回可保存为JSON的结果
+def runBenchmarks(engines, pointNumber=15, rounds=20, options=None):
+    options = options or {}
+    results = {"meta": {"python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "size": pointNumber,
+                        "rounds": rounds},
+               "board": {},
+               "engines": {name: {} for name in engines}}
+    for position, (seed, stones) in POSITIONS.items():
+        moves = makePosition(pointNumber, stones, seed)
+        results["board"][position] = benchmarkBoard(moves, pointNumber, rounds)
+        for name in engines:
+            results["engines"][name][position] = benchmarkEngine(
+                name, moves, pointNumber, rounds, options.get(name, {}))
+    return results
+
+# 把结果展开为(分组, 局面, 函数) -> 统计数据
+def flatten(results):
+    rows = {}
+    for position, functions in results["board"].items():
+        for function, stats in functions.items():
+            rows[("board", position, function)] = stats
+    for name, positions in results["engines"].items():
+        for position, functions in positions.items():
+            for function, stats in functions.items():
+                rows[(name, position, function)] = stats
+    return rows
+
+# 打印结果，多个引擎的同一项并列显示
+def printResults(results):
+    print(f"{'分组':<10}{'局面':<10}{'函数':<24}{'p50(us)':>12}{'p90(us)':>12}"
+          f"{'p99(us)':>12}{'次/秒':>12}")
+    for (group, position, function), stats in sorted(flatten(results).items(),
+                                                     key=lambda item: item[0][1:]):
+        print(f"{group:<10}{position:<10}{function:<24}{stats['p50']:>12.1f}"
+              f"{stats['p90']:>12.1f}{stats['p99']:>12.1f}{stats['perSecond']:>12.0f}")
+
+# 与保存的结果对比p50耗时，返回变慢超过maxRegression（比例）的项
+def compare(results, baseline, maxRegression):
+    regressions = []
+    current = flatten(results)
+    print(f"\n{'分组':<10}{'局面':<10}{'函数':<24}{'原p50(us)':>12}{'现p50(us)':>12}{'变化':>10}")
+    for key, old in sorted(flatten(baseline).items()):
+        if key not in current:
+            continue
+        new = current[key]
+        change = new["p50"] / old["p50"] - 1 if old["p50"] > 0 else 0.0
+        group, position, function = key
+        print(f"{group:<10}{position:<10}{function:<24}{old['p50']:>12.1f}"
+              f"{new['p50']:>12.1f}{change:>+10.1%}")
+        if change > maxRegression:
+            regressions.append(key)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="五子棋落子、评估及胜负判断的基准测试")
+    parser.add_argument("--engines", nargs="+", default=["machine"], choices=sorted(ENGINES),
+                        help="参与测试的引擎，多个引擎并列比较")
+    parser.add_argument("--size", type=int, default=15, help="棋盘每行每列的点数")
+    parser.add_argument("--rounds", type=int, default=20, help="每个局面重复测量的轮数")
+    parser.add_argument("--time-limit", type=float, default=0.2,
+                        help="search和mcts引擎每步的思考时间（秒）")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="search和mcts引擎搜索的进程数")
+    parser.add_argument("--output", help="保存结果的JSON文件")
+    parser.add_argument("--baseline", help="用于对比的历史结果JSON文件")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="与历史结果相比p50允许变慢的比例，超过时返回非0")
+    args = parser.parse_args()
+
+    options = {"search": {"timeLimit": args.time_limit, "workers": args.workers},
+               "mcts": {"timeLimit": args.time_limit, "workers": args.workers}}
+    results = runBenchmarks(args.engines, args.size, args.rounds, options)
+    printResults(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baselineFile:
+            baseline = json.load(baselineFile)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)}项变慢超过{args.max_regression:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#bitboard.py
+"""
+Created on Sun Oct 18 10:12:05 2026
+
+Description:五子棋的位棋盘实现，黑白双方各用一个整数的二进制位记录落子，
+横竖撇捺的连珠判断用移位与按位与完成
+"""
+
+import random
+
+ZOBRIST_SEED = 20200520 # Zobrist随机数种子，固定种子保证不同进程得到相同的哈希值
+_zobristKeys = {} # 各尺寸棋盘的Zobrist随机数表缓存
+# 各尺寸棋盘的对称变换表、五连窗口起始位表和各方向可走格数表的缓存，
+# 同一尺寸的棋盘共用，不应修改
+_symmetricIndices = {}
+_fiveStarts = {}
+_sideReach = {}
+
+# 横竖撇捺四个方向的单位偏移（与board.offset相同的四条线，统一取位序号递增的方向）
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+
+# 返回pointNumber路棋盘的Zobrist随机数表，按[棋子值][位序号]索引
+def zobristKeys(pointNumber):
+    if pointNumber not in _zobristKeys:
+        generator = random.Random(ZOBRIST_SEED + pointNumber)
+        size = (pointNumber + 1) * pointNumber
+        _zobristKeys[pointNumber] = [[0] * size] + \
+            [[generator.getrandbits(64) for i in range(size)] for value in (1, 2)]
+    return _zobristKeys[pointNumber]
+
+# 第symmetry种对称变换（0~7，0为不变）下点(x, y)的坐标：先按位2转置，
+# 再按位0、位1翻转x、y，八种变换即正方形棋盘的四种旋转及其镜像
+def transformPoint(symmetry, x, y, pointNumber):
+    if symmetry & 4:
+        x, y = y, x
+    if symmetry & 1:
+        x = pointNumber - 1 - x
+    if symmetry & 2:
+        y = pointNumber - 1 - y
+    return x, y
+
+# transformPoint的逆变换
+def inversePoint(symmetry, x, y, pointNumber):
+    if symmetry & 2:
+        y = pointNumber - 1 - y
+    if symmetry & 1:
+        x = pointNumber - 1 - x
+    if symmetry & 4:
+        x, y = y, x
+    return x, y
+
+# 返回pointNumber路棋盘每种对称变换下各位序号变换后的位序号，按[对称变换][位序号]索引
+def symmetricIndices(pointNumber):
+    if pointNumber not in _symmetricIndices:
+        stride = pointNumber + 1
+        table = [[0] * (stride * pointNumber) for i in range(8)]
+        for symmetry, indices in enumerate(table):
+            for y in range(pointNumber):
+                for x in range(pointNumber):
+                    newX, newY = transformPoint(symmetry, x, y, pointNumber)
+                    indices[y * stride + x] = newY * stride + newX
+        _symmetricIndices[pointNumber] = table
+    return _symmetricIndices[pointNumber]
+
+# 返回pointNumber路棋盘每个点每个方向上包含该点的五连窗口的起始位，
+# 按[方向的移位量][位序号]索引
+def fiveStarts(pointNumber):
+    if pointNumber not in _fiveStarts:
+        stride = pointNumber + 1
+        table = {}
+        for dx, dy in DIRECTIONS:
+            starts = [0] * (stride * pointNumber)
+            for y in range(pointNumber):
+                for x in range(pointNumber):
+                    for i in range(5): # 窗口起点在该点反方向0~4格处
+                        startX = x - i * dx
+                        startY = y - i * dy
+                        endX = startX + 4 * dx
+                        endY = startY + 4 * dy
+                        if 0 <= startX < pointNumber and 0 <= startY < pointNumber \
+                            and 0 <= endX < pointNumber and 0 <= endY < pointNumber:
+                            starts[y * stride + x] |= 1 << (startY * stride + startX)
+            table[dx + dy * stride] = starts
+        _fiveStarts[pointNumber] = table
+    return _fiveStarts[pointNumber]
+
+# 返回pointNumber路棋盘每个点沿八个方向在棋盘内最多能走几格（不超过5），
+# 按[(offsetX, offsetY)][位序号]索引
+def sideReach(pointNumber):
+    if pointNumber not in _sideReach:
+        stride = pointNumber + 1
+        table = {}
+        for dx, dy in DIRECTIONS:
+            for offsetX, offsetY in ((dx, dy), (-dx, -dy)):
+                reach = [0] * (stride * pointNumber)
+                for y in range(pointNumber):
+                    for x in range(pointNumber):
+                        steps = 0
+                        while steps < 5 and 0 <= x + (steps + 1) * offsetX < pointNumber \
+                            and 0 <= y + (steps + 1) * offsetY < pointNumber:
+                            steps += 1
+                        reach[y * stride + x] = steps
+                table[(offsetX, offsetY)] = reach
+        _sideReach[pointNumber] = table
+    return _sideReach[pointNumber]
+
+# 一侧五格中从第steps格起全部在棋盘外时，这些格子（每格编码为3）的编码之和
+EDGE_TAILS = [sum(3 * 4 ** i for i in range(steps, 5)) for steps in range(6)]
+
+class BitBoard:
+    # 初始化，每行多留一位空位作为分隔，防止移位时跨行相连
+    def __init__(self, pointNumber):
+        self._pointNumber = pointNumber # 棋盘每行每列的点数
+        self._stride = pointNumber + 1 # 每行占用的位数
+        self._stones = [0, 0, 0] # 下标为棋子的值，1为黑子，2为白子
+        self._keys = zobristKeys(pointNumber)
+        self.hash = 0 # 当前局面的Zobrist哈希值，落子和提子时增量更新
+        # 局面在八种对称变换下的Zobrist哈希值，hashes[0]即hash，同样增量更新
+        self.hashes = [0] * 8
+        # 每种对称变换下各位序号变换后的位序号
+        self._symmetricIndices = symmetricIndices(pointNumber)
+        # 棋盘上所有点组成的掩码，每行的分隔位不在其中
+        rowMask = (1 << pointNumber) - 1
+        self.fullMask = 0
+        for y in range(pointNumber):
+            self.fullMask |= rowMask << (y * self._stride)
+        # 每个点每个方向上包含该点的五连窗口的起始位，判断五子连珠时只需一次按位与
+        self._fiveStarts = fiveStarts(pointNumber)
+        # 每个点沿八个方向在棋盘内最多能走几格（不超过5），用于提取一侧五格的编码
+        self._reach = sideReach(pointNumber)
+
+    # 棋盘每行每列的点数
+    @property
+    def pointNumber(self):
+        return self._pointNumber
+
+    # 坐标对应的位序号
+    def index(self, x, y):
+        return y * self._stride + x
+
+    # 返回某方棋子的位集合
+    def stones(self, value):
+        return self._stones[value]
+
+    # 返回所给位置的棋子值（空0、黑1、白2）
+    def get(self, x, y):
+        bit = 1 << (y * self._stride + x)
+        if self._stones[1] & bit:
+            return 1
+        elif self._stones[2] & bit:
+            return 2
+        else:
+            return 0
+
+    # 判断所给位置是否为空
+    def isEmpty(self, x, y):
+        bit = 1 << (y * self._stride + x)
+        return not (self._stones[1] | self._stones[2]) & bit
+
+    # 在所给位置放置棋子
+    def place(self, value, x, y):
+        index = y * self._stride + x
+        self._stones[value] |= 1 << index
+        self._updateHashes(self._keys[value], index)
+
+    # 移除所给位置的棋子
+    def remove(self, x, y):
+        index = y * self._stride + x
+        self._updateHashes(self._keys[self.get(x, y)], index)
+        bit = ~(1 << index)
+        self._stones[1] &= bit
+        self._stones[2] &= bit
+
+    # 在八种对称变换下的哈希值中加入或去掉位序号index处的棋子
+    def _updateHashes(self, keys, index):
+        hashes = self.hashes
+        for symmetry, indices in enumerate(self._symmetricIndices):
+            hashes[symmetry] ^= keys[indices[index]]
+        self.hash = hashes[0]
+
+    # 局面的规范哈希：八种对称变换下最小的哈希值，返回(哈希值, 对应的变换)，
+    # 等价的局面得到相同的规范哈希
+    def canonicalHash(self):
+        key = min(self.hashes)
+        return key, self.hashes.index(key)
+
+    # 棋盘上的棋子总数
+    def count(self):
+        return (self._stones[1] | self._stones[2]).bit_count()
+
+    # 判断所给位置沿(offsetX, offsetY)所在的线上是否有包含该点的五子连珠
+    def hasFive(self, value, x, y, offsetX, offsetY):
+        shift = offsetX + offsetY * self._stride
+        if shift < 0: # 统一为位序号递增的方向
+            shift = -shift
+        stones = self._stones[value]
+        # 连续五位都为1的起始位
+        runs = stones & (stones >> shift) & (stones >> 2 * shift) \
+               & (stones >> 3 * shift) & (stones >> 4 * shift)
+        return runs & self._fiveStarts[shift][y * self._stride + x] != 0
+
+    # 判断所给位置沿(offsetX, offsetY)所在的线上是否有包含该点的恰好五子连珠（两端外侧
+    # 都不是己方棋子，即不是长连的一部分）
+    def hasExactFive(self, value, x, y, offsetX, offsetY):
+        shift = offsetX + offsetY * self._stride
+        if shift < 0:
+            shift = -shift
+        stones = self._stones[value]
+        runs = stones & (stones >> shift) & (stones >> 2 * shift) \
+               & (stones >> 3 * shift) & (stones >> 4 * shift)
+        runs &= ~(stones << shift) & ~(stones >> 5 * shift) # 前一格和后一格不是己方棋子
+        return runs & self._fiveStarts[shift][y * self._stride + x] != 0
+
+    # 判断所给位置沿(offsetX, offsetY)所在的线上是否有包含该点的六子及以上的长连
+    def hasOverline(self, value, x, y, offsetX, offsetY):
+        shift = offsetX + offsetY * self._stride
+        if shift < 0:
+            shift = -shift
+        stones = self._stones[value]
+        runs = stones & (stones >> shift) & (stones >> 2 * shift) \
+               & (stones >> 3 * shift) & (stones >> 4 * shift) & (stones >> 5 * shift)
+        # 包含该点的六连必有前五格或后五格组成包含该点的五连窗口
+        return (runs | (runs << shift)) & self._fiveStarts[shift][y * self._stride + x] != 0
+
+    # 判断所给位置的棋子在横竖撇捺任一方向上是否恰好五子连珠
+    def isExactFive(self, value, x, y):
+        for dx, dy in DIRECTIONS:
+            if self.hasExactFive(value, x, y, dx, dy):
+                return True
+        return False
+
+    # 判断所给位置的棋子在横竖撇捺任一方向上是否五子连珠
+    def isFive(self, value, x, y):
+        for dx, dy in DIRECTIONS:
+            if self.hasFive(value, x, y, dx, dy):
+                return True
+        return False
+
+    # 所给位置沿(offsetX, offsetY)一侧五格的四进制编码，偏移i格处为第i-1位，
+    # 每格空0、mine方棋子1、另一方棋子2、棋盘外3
+    def sideCode(self, x, y, offsetX, offsetY, mine):
+        index = y * self._stride + x
+        shift = offsetX + offsetY * self._stride
+        steps = self._reach[(offsetX, offsetY)][index]
+        mineStones = self._stones[mine]
+        otherStones = self._stones[3 - mine]
+        code = EDGE_TAILS[steps] # 棋盘外的格子
+        weight = 1
+        for i in range(steps):
+            index += shift
+            if (mineStones >> index) & 1:
+                code += weight
+            elif (otherStones >> index) & 1:
+                code += 2 * weight
+            weight *= 4
+        return code
+
+    # 返回掩码中所有为1的位对应的坐标(x, y)
+    def bitPoints(self, mask):
+        points = []
+        while mask:
+            low = mask & -mask # 最低位的1
+            index = low.bit_length() - 1
+            points.append((index % self._stride, index // self._stride))
+            mask ^= low
+        return points
+
+    # 转换为按[y][x]索引的二维数组
+    def toList(self):
+        return [[self.get(x, y) for x in range(self._pointNumber)]
+                for y in range(self._pointNumber)]
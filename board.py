@@ -1,92 +1,210 @@
-#board.py
-"""
-Created on Wed May 20 16:03:37 2020
-
-@author: Guocheng Lin
-@email: lgc0208@bupt.edu.cn
-
-Description:五子棋的棋盘及基本功能判断实现
-"""
-
-import collections # 从collections导入nametuple
-
-# 存储棋子及其颜色序列
-chessMan = collections.namedtuple("chess", ["Name", "Value", "Color"]) 
-Point = collections.namedtuple("point", ["X", "Y"]) # 存取点坐标序列
-
-offset = [(1, 0), (0, 1), (1, 1), (1, -1)] #横竖撇捺判断棋子附近是否有其它棋子
-
-# 初始化黑白子参数，黑子用1替代进行判断，白子用2替代进行判断
-BLACK_CHESSMAN = chessMan("黑子", 1, (0, 0, 0))
-WHITE_CHESSMAN = chessMan("白子", 2, (255, 255, 255))
-
-# 创建棋盘类
-class Board: 
-    
-    # 构造函数(!!!双下划线)
-    def __init__(self, pointNumber): 
-        self._linePoints = pointNumber # 定义成员
-        # 用数组实例化棋盘，建立pointNumber个数组成员，初始值都赋值为0
-        self._board = [[0] * pointNumber for i in range(pointNumber)]
-    
-    # 返回_board成员
-    def _getBoard(self): 
-        return self._board
-   
-    board = property(_getBoard) # 调用类中的函数
-     
-    # 判断是否落子
-    def ifDropChess(self, point):
-        if self._board[point.Y][point.X] == 0: # 若该位置无棋子
-            return True
-        else: 
-            return False
-    
-    #通过横竖撇捺四个方向计算是否五子连珠
-    def countDirection(self, point, value, offsetX, offsetY):
-        count = 1 # 计算连珠个数
-        
-        # 判断所下棋子右侧是否五子连珠
-        for i in range(1, 5):
-            x = point.X + i*offsetX
-            y = point.Y + i*offsetY
-            if 0 <= x < self._linePoints \
-            and 0 <= y < self._linePoints \
-            and value == self._board[y][x]:
-                count += 1
-            else:
-                break
-            
-        # 判断所下棋子左侧是否五子连珠
-        for i in range(1, 5):
-            x = point.X - i*offsetX
-            y = point.Y - i*offsetY
-            if 0 <= x < self._linePoints \
-                and 0 <= y < self._linePoints \
-                and value == self._board[y][x]:
-                count += 1
-            else:
-                break
-            
-        judgeWin = (count >= 5) # 判断是否达成五子连珠，达成为True
-        return judgeWin # 返回判断结果
-    
-    # 判断是否胜利
-    def win(self, point):
-        currentValue = self._board[point.Y][point.X] #得到当前值
-        for offsetArray in offset: # 循环判断四个方向是否五子连珠
-            if self.countDirection(point, currentValue, 
-                                   offsetArray[0], 
-                                   offsetArray[1]):
-                return True # 若if中的判断结果为True，则返回True
-            
-    #落子 chessMan表示棋子，point表示落子位置
-    def dropChess(self, chessMan, point):
-        # print带f可执行字符串中的表达式
-        print(f"{chessMan.Name}({point.X}, {point.Y})")
-        self._board[point.Y][point.X] = chessMan.Value
-        if self.win(point): #若胜利，显示结果；若失败，不执行
-            print(f"{chessMan.Name}获胜啦！")
-            return chessMan 
-
-
+#board.py
+"""
+Created on Wed May 20 16:03:37 2020
+
+@author: Guocheng Lin
+@email: lgc0208@bupt.edu.cn
+
+Description:五子棋的棋盘及基本功能判断实现
+"""
+
+import collections # 从collections导入nametuple
+import logging
+from bitboard import BitBoard, transformPoint, inversePoint
+from rules import FreestyleRule
+
+# 存储棋子及其颜色序列
+chessMan = collections.namedtuple("chess", ["Name", "Value", "Color"]) 
+Point = collections.namedtuple("point", ["X", "Y"]) # 存取点坐标序列
+
+# 落子和胜负的日志，默认不输出；需要时由程序入口配置logging
+logger = logging.getLogger(__name__)
+
+offset = [(1, 0), (0, 1), (1, 1), (1, -1)] #横竖撇捺判断棋子附近是否有其它棋子
+
+# 初始化黑白子参数，黑子用1替代进行判断，白子用2替代进行判断
+BLACK_CHESSMAN = chessMan("黑子", 1, (0, 0, 0))
+WHITE_CHESSMAN = chessMan("白子", 2, (255, 255, 255))
+# 和棋时dropChess返回的结果，值为0，与对局记录中表示和棋的胜者值一致
+DRAW = chessMan("和棋", 0, None)
+
+_windowTables = {} # 各大小棋盘的五格窗口表
+
+# 返回pointNumber路棋盘上所有五格窗口（横竖撇捺方向上连续的五个点）的个数，
+# 及每个点所在窗口的序号，按y*pointNumber+x索引
+def _getWindows(pointNumber):
+    if pointNumber not in _windowTables:
+        pointWindows = [[] for i in range(pointNumber * pointNumber)]
+        count = 0
+        for offsetX, offsetY in offset:
+            for y in range(pointNumber):
+                for x in range(pointNumber):
+                    endX = x + 4 * offsetX
+                    endY = y + 4 * offsetY
+                    if 0 <= endX < pointNumber and 0 <= endY < pointNumber:
+                        for i in range(5):
+                            pointWindows[(y + i * offsetY) * pointNumber
+                                         + x + i * offsetX].append(count)
+                        count += 1
+        _windowTables[pointNumber] = (count, pointWindows)
+    return _windowTables[pointNumber]
+
+# 创建棋盘类
+class Board: 
+    
+    # 构造函数(!!!双下划线)，rule为规则变体（见rules.py），默认为无禁手
+    def __init__(self, pointNumber, rule=None): 
+        self._linePoints = pointNumber # 定义成员
+        self._rule = rule or FreestyleRule()
+        # 用位棋盘实例化棋盘，黑白双方各用一个整数记录落子
+        self._board = BitBoard(pointNumber)
+        self._moves = [] # 按顺序记录的落子位置
+        self._listeners = [] # 落子后调用的回调函数
+        self._moveListeners = [] # 放置、撤销棋子后调用的回调函数，供跟随棋盘的引擎更新缓存
+        # 每个五格窗口中双方的棋子数，及各方还能连成五子的窗口数（窗口中没有对方的棋子）；
+        # 落子和撤销时只更新该点所在的窗口
+        windowCount, self._pointWindows = _getWindows(pointNumber)
+        self._windowStones = {BLACK_CHESSMAN.Value: [0] * windowCount,
+                              WHITE_CHESSMAN.Value: [0] * windowCount}
+        self._openWindows = {BLACK_CHESSMAN.Value: windowCount,
+                             WHITE_CHESSMAN.Value: windowCount}
+    
+    # 返回按[y][x]索引的棋盘数组
+    def _getBoard(self): 
+        return self._board.toList()
+   
+    board = property(_getBoard) # 调用类中的函数
+    
+    # 返回位棋盘
+    def _getBits(self):
+        return self._board
+    
+    bits = property(_getBits)
+    
+    # 返回当前局面的Zobrist哈希值，落子时增量更新
+    def _getHash(self):
+        return self._board.hash
+    
+    hash = property(_getHash)
+    
+    # 返回按顺序记录的落子位置
+    def _getMoves(self):
+        return self._moves
+    
+    moves = property(_getMoves)
+    
+    # 返回规则变体
+    def _getRule(self):
+        return self._rule
+    
+    rule = property(_getRule)
+    
+    # 返回当前局面的规范哈希及对应的对称变换：棋盘的八种旋转、镜像中哈希值最小的一种，
+    # 等价的局面得到相同的规范哈希，可用于缓存、开局库等按局面索引的数据
+    def canonicalHash(self):
+        return self._board.canonicalHash()
+    
+    # 将点变换到symmetry对应的规范方向
+    def toCanonical(self, point, symmetry):
+        return Point(*transformPoint(symmetry, point.X, point.Y, self._linePoints))
+    
+    # 将规范方向的点变换回当前棋盘的方向
+    def fromCanonical(self, point, symmetry):
+        return Point(*inversePoint(symmetry, point.X, point.Y, self._linePoints))
+     
+    # 判断是否落子
+    def ifDropChess(self, point):
+        if self._board.isEmpty(point.X, point.Y): # 若该位置无棋子
+            return True
+        else: 
+            return False
+    
+    #通过横竖撇捺四个方向计算是否五子连珠
+    def countDirection(self, point, value, offsetX, offsetY):
+        # 用移位和按位与找出该方向上包含该点的五子连珠，达成为True
+        judgeWin = self._board.hasFive(value, point.X, point.Y, offsetX, offsetY)
+        return judgeWin # 返回判断结果
+    
+    # 判断是否胜利，按规则判断五连或恰好五连
+    def win(self, point):
+        currentValue = self._board.get(point.X, point.Y) #得到当前值
+        return self._rule.isWin(self._board, currentValue, point.X, point.Y)
+    
+    # 判断chessMan方是否还有可能连成五子：还有没有对方棋子的五格窗口
+    def canWin(self, chessMan):
+        return self._openWindows[chessMan.Value] > 0
+    
+    # 判断是否和棋：棋盘已下满，或双方都已不可能连成五子。按五子及以上连珠判断，
+    # 有长连、禁手限制的规则中可能晚于实际无法获胜时才判为和棋
+    def isDraw(self):
+        if len(self._moves) == self._linePoints * self._linePoints:
+            return True
+        return not (self._openWindows[BLACK_CHESSMAN.Value]
+                    or self._openWindows[WHITE_CHESSMAN.Value])
+    
+    # 放置（change为1）或撤销（change为-1）value方在point的棋子后更新所在窗口的计数
+    def _updateWindows(self, point, value, change):
+        stones = self._windowStones[value]
+        rival = 3 - value
+        for window in self._pointWindows[point.Y * self._linePoints + point.X]:
+            if change < 0:
+                stones[window] -= 1
+            if stones[window] == 0: # 窗口中己方的棋子从无到有或从有到无，对方能否在此连五随之改变
+                self._openWindows[rival] -= change
+            if change > 0:
+                stones[window] += 1
+    
+    # 判断chessMan方在空位point落子是否为禁手
+    def isForbidden(self, chessMan, point):
+        return self._rule.isForbidden(self._board, chessMan.Value, point.X, point.Y)
+            
+    # 添加落子后的回调函数listener(chessMan, point, winner)，winner为胜者，和棋时为DRAW，
+    # 未分胜负时为None
+    def addListener(self, listener):
+        self._listeners.append(listener)
+    
+    # 移除落子后的回调函数
+    def removeListener(self, listener):
+        self._listeners.remove(listener)
+    
+    # 添加放置、撤销棋子后的回调函数listener(point, change)，放置时change为1，撤销时为-1
+    def addMoveListener(self, listener):
+        self._moveListeners.append(listener)
+    
+    # 移除放置、撤销棋子后的回调函数
+    def removeMoveListener(self, listener):
+        self._moveListeners.remove(listener)
+    
+    # 在所给位置放置值为value的棋子，不判断胜负、不记日志（供引擎搜索时试探落子）
+    def makeMove(self, point, value):
+        self._board.place(value, point.X, point.Y)
+        self._moves.append(point)
+        self._updateWindows(point, value, 1)
+        for listener in self._moveListeners:
+            listener(point, 1)
+    
+    # 撤销最后放置的棋子，返回其位置
+    def unmakeMove(self):
+        point = self._moves.pop()
+        self._updateWindows(point, self._board.get(point.X, point.Y), -1)
+        self._board.remove(point.X, point.Y)
+        for listener in self._moveListeners:
+            listener(point, -1)
+        return point
+    
+    #落子 chessMan表示棋子，point表示落子位置；返回胜者，和棋时返回DRAW，未分胜负时返回None
+    def dropChess(self, chessMan, point):
+        logger.info("%s(%d, %d)", chessMan.Name, point.X, point.Y)
+        self.makeMove(point, chessMan.Value)
+        winner = None
+        if self.win(point): #若胜利，记录结果；若失败，不执行
+            logger.info("%s获胜啦！", chessMan.Name)
+            winner = chessMan
+        elif self.isDraw():
+            logger.info("双方都已无法连成五子，和棋")
+            winner = DRAW
+        for listener in self._listeners:
+            listener(chessMan, point, winner)
+        return winner 
+
+
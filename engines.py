@@ -0,0 +1,35 @@
+#engines.py
+"""
+Created on Tue Oct 20 10:15:26 2026
+
+Description:五子棋AI引擎的注册表，按名称创建引擎，供自我对弈、基准测试等工具
+统一选择；所有引擎都提供getRivalDrop和machineDrop两个接口
+"""
+import random
+from machine import Machine
+from search import SearchMachine
+from mcts import MCTSMachine
+
+# 随机落子的基准引擎，在已有棋子周围两格内随机选点
+class RandomMachine(Machine):
+    # 机器落子
+    def machineDrop(self):
+        candidates = [candidate for candidate in sorted(self._candidates)
+                      if not self.isForbidden(candidate)]
+        if candidates:
+            point = random.choice(candidates)
+        else: # 棋盘上还没有棋子或已下满
+            point = self.anyMove()
+        return self._commit(point)
+
+# 引擎名称与类的对应关系
+ENGINES = {"machine": Machine,
+           "search": SearchMachine,
+           "random": RandomMachine,
+           "mcts": MCTSMachine}
+
+# 按名称创建引擎，options为传给引擎构造函数的其它参数
+def createEngine(name, pointNumber, chessMan, **options):
+    if name not in ENGINES:
+        raise ValueError(f"未知的引擎：{name}，可选：{', '.join(ENGINES)}")
+    return ENGINES[name](pointNumber, chessMan, **options)
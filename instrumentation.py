@@ -0,0 +1,105 @@
+#instrumentation.py
+"""
+Created on Fri Oct 23 09:41:16 2026
+
+Description:AI落子的性能统计。启用时用计时包装替换引擎实例上的热点方法，
+统计每步各方法的调用次数和累计耗时（包含其内部调用的耗时）、搜索节点数和
+置换表命中数；只替换实例属性，不修改类，未启用的引擎没有任何额外开销
+"""
+from collections import Counter, defaultdict
+from time import perf_counter
+
+# 统计的方法，引擎没有的方法跳过
+FUNCTIONS = ["_updateScores", "getDirectionScore", "makeMove", "unmakeMove", "bookMove",
+             "threatMove", "searchMove"]
+
+class Profiler:
+    def __init__(self):
+        self.calls = Counter() # 本步各方法的调用次数
+        self.seconds = defaultdict(float) # 本步各方法的累计耗时（秒）
+        self.moves = [] # 每步的统计，元素同last
+        self.last = None # 最近一步的统计
+        self._engines = []
+
+    # 为引擎的热点方法加上计时，SearchMachine对手视角的机器一并统计
+    def attach(self, engine):
+        self._engines.append(engine)
+        for target in (engine, getattr(engine, "_shadow", None)):
+            if target is None:
+                continue
+            for name in FUNCTIONS:
+                if hasattr(target, name):
+                    setattr(target, name, self._timed(name, getattr(target, name)))
+        engine.machineDrop = self._measured(engine, engine.machineDrop)
+
+    # 去掉引擎上的计时包装，恢复为类中的方法
+    def detach(self, engine):
+        for target in (engine, getattr(engine, "_shadow", None)):
+            if target is None:
+                continue
+            for name in FUNCTIONS + ["machineDrop"]:
+                target.__dict__.pop(name, None)
+        self._engines.remove(engine)
+
+    # 去掉所有引擎上的计时包装
+    def detachAll(self):
+        for engine in list(self._engines):
+            self.detach(engine)
+
+    def _timed(self, name, function):
+        calls = self.calls
+        seconds = self.seconds
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds[name] += perf_counter() - start
+                calls[name] += 1
+        return timed
+
+    # 包装machineDrop：每步开始时清零计数，结束时记录本步的统计
+    def _measured(self, engine, machineDrop):
+        def measured():
+            self.calls.clear()
+            self.seconds.clear()
+            table = getattr(engine, "table", None)
+            hits = table.hits if table is not None else 0
+            probes = table.hits + table.misses if table is not None else 0
+            start = perf_counter()
+            point = machineDrop()
+            # 无处可下时落子位置为None
+            stats = {"point": (point.X, point.Y) if point is not None else None,
+                     "seconds": perf_counter() - start,
+                     "calls": dict(self.calls),
+                     "time": dict(self.seconds),
+                     "nodes": 0, # 搜索的节点数
+                     "threatNodes": 0, # 威胁空间搜索的节点数
+                     "tableHits": 0, # 置换表命中次数
+                     "tableProbes": 0} # 置换表查询次数
+            if "searchMove" in self.calls:
+                stats["nodes"] = engine.nodes
+            threats = getattr(engine, "_threats", None)
+            if threats is not None and "threatMove" in self.calls:
+                stats["threatNodes"] = threats.nodes
+            if table is not None:
+                stats["tableHits"] = table.hits - hits
+                stats["tableProbes"] = table.hits + table.misses - probes
+            self.last = stats
+            self.moves.append(stats)
+            return point
+        return measured
+
+    # 所有已记录步数的汇总：总步数、总耗时、最慢一步的耗时及各方法的调用次数和耗时
+    def summary(self):
+        calls = Counter()
+        seconds = defaultdict(float)
+        for stats in self.moves:
+            calls.update(stats["calls"])
+            for name, value in stats["time"].items():
+                seconds[name] += value
+        return {"moves": len(self.moves),
+                "seconds": sum(stats["seconds"] for stats in self.moves),
+                "slowest": max((stats["seconds"] for stats in self.moves), default=0.0),
+                "calls": dict(calls),
+                "time": dict(seconds)}
@@ -1,215 +1,197 @@
-﻿#machine.py
-"""
-Created on Fri May 22 20:45:00 2020
-
-@author: Guocheng Lin
-@email: lgc0208@bupt.edu.cn
-
-Description:五子棋人机对战的机器类实现
-"""
-from board import BLACK_CHESSMAN, Point, offset
-import random
-
-class Machine:
-    # 初始化
-    def __init__(self, pointNumber, chessMan):
-        self._pointNumber = pointNumber # 棋盘点的数量
-        self._my = chessMan # 己方执子
-        self._rival = BLACK_CHESSMAN # 敌方执子
-        # 初始化棋盘，所有元素置0
-        self._board = [[0] * pointNumber for i in range(pointNumber)]
-    
-    # 得到对手落子位置
-    def getRivalDrop(self, point):
-        self._board[point.Y][point.X] = self._rival.Value
-    
-    # 判定所给位置方向上两格的落子情况（我方1、敌方2、空0）
-    def getPiece(self, point, offsetX, offsetY, TorF):
-        x = point.X + offsetX # 将x赋值为当前位置+偏移量
-        y = point.Y + offsetY # 将y赋值为当前位置+偏移量
-        if 0 <= x < self._pointNumber and 0 <= y < self._pointNumber: # 当偏移后的值在棋盘范围内时
-            if self._board[y][x] == self._my.Value: # 若落子位置偏移方向有我方棋子
-                return 1 # 返回1表示是我方棋子
-            elif self._board[y][x] == self._rival.Value: # 若落子位置偏移方向有敌方棋子
-                return 2 # 返回2表示是敌方棋子
-            else: # 若无棋子
-                if TorF: # 是否继续判断
-                    # 当偏移超过两次不存在棋子时，不予继续考虑
-                    return self.getPiece(Point(x, y),
-                                         offsetX, offsetY,
-                                         False)
-                else:
-                    return 0 # 表示该方向两格内不存在棋子
-        else:
-            return 0
-        
-    # 统计某方向棋子权重值
-    def getDirectionScore(self, point, offsetX, offsetY):
-        countSelf = 0   # 落子处我方连续子数
-        countOpposite = 0  # 落子处对方连续子数
-        spaceSelf = None   # 我方连续子中有无空格
-        spaceOpposite = None  # 对方连续子中有无空格
-        blockSelf = 0    # 我方连续子两端有无阻挡
-        blockOpposite = 0   # 对方连续子两端有无阻挡
-
-        # 如果是 1 表示是边上是我方子，2 表示敌方子， 0表示无子
-        flagPositive = self.getPiece(point, offsetX, offsetY, True)
-        if flagPositive != 0: # 传入的偏移方向上若存在棋子
-            for i in range(1, 6): # 循环判断该方向连着几个棋子
-                x = point.X + i * offsetX 
-                y = point.Y + i * offsetY 
-                # 若加上偏移量后仍在棋盘内
-                if 0 <= x < self._pointNumber and 0 <= y < self._pointNumber:
-                    if flagPositive == 1: # 若该偏移方向两格内有我方棋子
-                        if self._board[y][x] == self._my.Value: #若该位置有我方棋子
-                            countSelf += 1 # 我方连续棋子数+1
-                            if spaceSelf is False: # 若已经出现过空格，且探测到我方棋子
-                                spaceSelf = True  # 空格出现在我方连续棋子之间
-                        elif self._board[y][x] == self._rival.Value: # 若该位置是敌方棋子
-                            blockOpposite += 1 # 敌方棋子受阻挡+1
-                            break # 落子后我方安全，跳出循环
-                        else: # 若该位置不存在棋子
-                            if spaceSelf is None: # 第一次检测到空格时生效
-                                spaceSelf = False # 表示存在空格但不在白子之间
-                            else:
-                                break   # 遇到第二个空格退出循环
-                    elif flagPositive == 2: # 若该偏移方向上有敌方棋子
-                        if self._board[y][x] == self._my.Value:
-                            blockOpposite += 1 # 敌方受阻挡+1
-                            break # 我方安全，跳出循环
-                        elif self._board[y][x] == self._rival.Value: # 该位置存在敌方棋子
-                            countOpposite += 1 # 敌方连续棋子数+1
-                            if spaceOpposite is False: # 若第二次出现空格
-                                spaceOpposite = True # 对方连续棋子内出现空格事件为
-                        else:
-                            if spaceOpposite is None: # 若第一次出现空格
-                                spaceOpposite = False # 敌方连续棋子内还未出现空格
-                            else:
-                                break # 若在出现敌方棋子前又出现空格，我方安全，跳出循环
-                else: # 偏移后触碰到棋盘边界
-                    if flagPositive == 1: # 若为己方棋子
-                        blockSelf += 1 # 己方棋子被堵塞量+1
-                    elif flagPositive == 2: # 若为敌方棋子
-                        blockOpposite += 1 # 敌方棋子被堵塞量+1
-
-        if spaceSelf is False: # 若己方连续棋子内不存在空格
-            spaceSelf = None # 重置
-        if spaceOpposite is False: # 若对方连续棋子内不存在空格
-            spaceOpposite = None # 重置
-
-        # 将设定的偏移量里的X,Y增量取反，重复上述操作
-        flagNegative = self.getPiece(point, -offsetX, -offsetY, True)
-        if flagNegative != 0:
-            for i in range(1, 6):
-                x = point.X - i * offsetX
-                y = point.Y - i * offsetY
-                if 0 <= x < self._pointNumber and 0 <= y < self._pointNumber:
-                    if flagNegative == 1:
-                        if self._board[y][x] == self._my.Value:
-                            countSelf += 1
-                            if spaceSelf is False:
-                                spaceSelf = True
-                        elif self._board[y][x] == self._rival.Value:
-                            blockOpposite += 1
-                            break
-                        else:
-                            if spaceSelf is None:
-                                spaceSelf = False
-                            else:
-                                break   # 遇到第二个空格退出
-                    elif flagNegative == 2:
-                        if self._board[y][x] == self._my.Value:
-                            blockOpposite += 1
-                            break
-                        elif self._board[y][x] == self._rival.Value:
-                            countOpposite += 1
-                            if spaceOpposite is False:
-                                spaceOpposite = True
-                        else:
-                            if spaceOpposite is None:
-                                spaceOpposite = False
-                            else:
-                                break
-                else:
-                    if flagNegative == 1:
-                        blockSelf += 1
-                    elif flagNegative == 2:
-                        blockOpposite += 1
-        '''
-        权重值划分：
-        （己方连续四子>敌方连续四子）>（己方连续三子无阻挡>敌方连续三子无阻挡）>（己方连续三子有一个阻挡&&己方连续两子无阻挡
-        >敌方连续三子有阻挡&&敌方连续两子无阻挡）>（己方连续两子有阻挡>敌方连续两子有阻挡）
-        无空格>有空格，两种情况应在同一数量级（紧跟在括号后）
-        优先级量化 8 10 80 100 800 1000 8000 10000 五组（当数值相近的时候会变成人工智障，不知为啥）
-        '''
-        score = 0 # 初始化权重值，判断落子选择的优先级
-        if countSelf == 4: # 若己方连续四子
-            score = 10000 # 优先级参考备注
-        elif countOpposite == 4: # 若敌方连续四子
-            score = 8000 # 优先级参考备注
-        elif countSelf == 3: # 若我方连续三子
-            if blockSelf == 0: # 若我方连续三子无阻挡
-                score = 1000 # 优先级参考备注
-            elif blockSelf == 1: # 若我方连续三子中有一个阻挡
-                score = 100 # 优先级参考备注
-            else:
-                score = 0 # 优先级最低
-        elif countOpposite == 3: # 若敌方连续三子
-            if blockOpposite == 0: # 若敌方连续三子无阻挡
-                score = 800 # 优先级参考备注
-            elif blockOpposite == 1: # 若敌方连续三子中有一个阻挡
-                score = 80 # 优先级参考备注
-            else: 
-                score = 0 # 优先级最低
-        elif countSelf == 2: # 若己方连续两子
-            if blockSelf == 0: # 若己方两子间没有阻挡
-                score = 100 # 优先级参考备注
-            elif blockSelf == 1: # 若两子间有一个阻挡
-                score = 80 # 优先级参考备注
-            else:
-                score = 0 # 优先级最低
-        elif countOpposite == 2: # 若敌方连续两子
-            if blockOpposite == 0: # 若敌方两子间没有阻挡
-                score = 10 # 优先级参考备注
-            elif blockOpposite == 1: # 若敌方两子间有一个阻挡
-                score = 8 # 优先级参考备注
-            else: 
-                score = 0 # 优先级为0
-        elif countSelf == 1: # 若己方只有单个落子
-            score = 10 # 优先级参考备注
-        elif countOpposite == 1: # 若对方只有单个落子
-            score = 8 # 优先级参考备注
-        else:
-            score = 0 # 优先级最低
-
-        if spaceSelf or spaceOpposite: # 若己方或对方连续棋子内存在空格
-            score /= 2 # 优先级降低
-
-        return score # 返回优先级
-    
-    # 统计落子优先级
-    def getPointScore(self, point):
-        score = 0
-        for i in offset: # 利用偏移量计算横竖撇捺落子优先级
-            score += self.getDirectionScore(point, i[0], i[1])
-        return score
-    
-    # 机器落子
-    def machineDrop(self):
-        point = None 
-        score = 0
-        # 遍历棋盘
-        for i in range(self._pointNumber):
-            for j in range(self._pointNumber):
-                if self._board[j][i] == 0: # 寻找尚未落子的位置
-                    scoreTemp = self.getPointScore(Point(i, j)) # 判断落子优先级
-                    # 寻找优先级最高的落子位置
-                    if scoreTemp > score: 
-                        score = scoreTemp
-                        point = Point(i, j)
-                    elif scoreTemp == score and scoreTemp > 0:
-                        radius = random.randint(0, 100)
-                        if radius % 2 == 0:
-                            point = Point(i, j)
-        self._board[point.Y][point.X] = self._my.Value # 在优先级最高的位置落子
-        return point # 返回优先级最高的位置信息
\ No newline at end of file
+﻿#machine.py
+"""
+Created on Fri May 22 20:45:00 2020
+
+@author: Guocheng Lin
+@email: lgc0208@bupt.edu.cn
+
+Description:五子棋人机对战的机器类实现
+"""
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point, offset
+from patterns import SIDE_OFFSETS, LINE_SCORES
+from openingbook import loadBook
+from threats import ThreatSearch
+import random
+
+class Machine:
+    # 初始化，book为开局库文件的路径或已打开的开局库，为None时不使用开局库；
+    # threatNodes、threatTime为每步威胁空间搜索的节点数和时间（秒）预算，threatNodes为0时
+    # 不搜索（默认），threatTime为None时只限节点数，同一局面总是得到相同的结果；
+    # rule为规则变体（见rules.py），默认为无禁手；board为与对局共用的棋盘，为None时使用
+    # 私有棋盘。共用棋盘时对手和己方的落子都由棋盘的持有者调用dropChess落下，引擎随棋盘
+    # 更新缓存，getRivalDrop不再重复落子，machineDrop只返回落子位置
+    def __init__(self, pointNumber, chessMan, book=None, threatNodes=0, threatTime=None,
+                 rule=None, board=None):
+        self._pointNumber = pointNumber # 棋盘点的数量
+        self._my = chessMan # 己方执子
+        # 敌方执子为己方之外的另一方
+        if chessMan == BLACK_CHESSMAN:
+            self._rival = WHITE_CHESSMAN
+        else:
+            self._rival = BLACK_CHESSMAN
+        self._shared = board is not None
+        if board is None:
+            board = Board(pointNumber, rule)
+        self._position = board # 所在的棋盘对象，落子和撤销都经由它进行
+        # 棋盘的位棋盘，黑白双方各用一个整数记录落子
+        self._board = board.bits
+        # 各点横竖撇捺四个方向的权重缓存，落子后只更新受影响的点
+        self._scores = [[[0] * len(offset) for i in range(pointNumber)]
+                        for j in range(pointNumber)]
+        # 各点周围两格内的棋子数，及周围两格内有棋子的空位（候选落子点）
+        self._near = [[0] * pointNumber for i in range(pointNumber)]
+        self._candidates = set()
+        if isinstance(book, str):
+            book = loadBook(book)
+        if book is not None and book.pointNumber != pointNumber:
+            raise ValueError(f"开局库为{book.pointNumber}路棋盘，与{pointNumber}路棋盘不符")
+        self._book = book
+        self._rule = rule or board.rule
+        # 落子前先在威胁空间中寻找必胜和必须防守的点；威胁搜索把长连也当作五连，
+        # 只用于长连获胜的规则
+        if threatNodes > 0 and self._rule.overlineWins:
+            self._threats = ThreatSearch(self._board, threatNodes, threatTime)
+        else:
+            self._threats = None
+        for point in board.moves: # 共用的棋盘上已有的棋子
+            self._moved(point, 1)
+        board.addMoveListener(self._moved)
+    
+    # 得到对手落子位置
+    def getRivalDrop(self, point):
+        if not self._shared:
+            self.makeMove(point, self._rival.Value)
+    
+    # 在所给位置放置值为value的棋子，权重缓存随棋盘的回调更新
+    def makeMove(self, point, value):
+        self._position.makeMove(point, value)
+    
+    # 撤销最后放置的所给位置的棋子（供搜索时回退使用）
+    def unmakeMove(self, point):
+        self._position.unmakeMove()
+    
+    # 棋盘上放置（change为1）或撤销（change为-1）棋子后更新权重缓存和候选落子点
+    def _moved(self, point, change):
+        self._updateScores(point)
+        self._updateCandidates(point, change)
+    
+    # 确定己方的落子：使用私有棋盘时在其上落子，共用棋盘时由棋盘的持有者落子；
+    # point为None（棋盘已满）时不落子
+    def _commit(self, point):
+        if point is not None and not self._shared:
+            self.makeMove(point, self._my.Value)
+        return point
+    
+    # 落子（change为1）或撤销（change为-1）后更新周围两格内的候选落子点
+    def _updateCandidates(self, point, change):
+        for y in range(max(point.Y - 2, 0), min(point.Y + 3, self._pointNumber)):
+            for x in range(max(point.X - 2, 0), min(point.X + 3, self._pointNumber)):
+                self._near[y][x] += change
+                if self._near[y][x] == 0:
+                    self._candidates.discard(Point(x, y))
+                elif self._board.isEmpty(x, y):
+                    self._candidates.add(Point(x, y))
+        if change > 0: # 落子处不再是候选点
+            self._candidates.discard(point)
+    
+    # 落子后更新该点横竖撇捺方向上五格内空位的权重缓存
+    def _updateScores(self, point):
+        for k, (offsetX, offsetY) in enumerate(offset):
+            for i in range(-5, 6): # 某方向的权重只与该方向五格内的棋子有关
+                x = point.X + i * offsetX
+                y = point.Y + i * offsetY
+                if 0 <= x < self._pointNumber and 0 <= y < self._pointNumber \
+                    and self._board.isEmpty(x, y):
+                    self._scores[y][x][k] = self.getDirectionScore(Point(x, y),
+                                                                   offsetX, offsetY)
+    
+    # 返回所给空位缓存的落子优先级，与getPointScore相同，但不重新计算
+    def getCachedScore(self, point):
+        return sum(self._scores[point.Y][point.X])
+
+    # 返回所有权重大于0的候选点及其缓存的权重，元素为(权重, 位置)，
+    # ordered为True时按权重从高到低排序
+    def getCandidates(self, ordered=False):
+        candidates = []
+        for point in self._candidates:
+            score = sum(self._scores[point.Y][point.X])
+            if score > 0:
+                candidates.append((score, point))
+        if ordered:
+            candidates.sort(key=lambda item: item[0], reverse=True)
+        return candidates
+    
+    # 统计某方向棋子权重值：两侧各五格编码后查预先算好的权重表（权重划分见patterns.py）
+    def getDirectionScore(self, point, offsetX, offsetY):
+        positive = self._board.sideCode(point.X, point.Y, offsetX, offsetY, self._my.Value)
+        negative = self._board.sideCode(point.X, point.Y, -offsetX, -offsetY, self._my.Value)
+        return LINE_SCORES[SIDE_OFFSETS[positive] + negative]
+    
+    # 统计落子优先级
+    def getPointScore(self, point):
+        score = 0
+        for i in offset: # 利用偏移量计算横竖撇捺落子优先级
+            score += self.getDirectionScore(point, i[0], i[1])
+        return score
+    
+    # 开局库对当前局面的推荐落子，未使用开局库或未收录时返回None
+    def bookMove(self):
+        if self._book is None:
+            return None
+        return self._book.lookup(self._board)
+
+    # 威胁空间搜索得到的落子（成五、挡五、连续冲四或连续威胁取胜、防守对手的连续冲四），
+    # 未启用或没有找到时返回None
+    def threatMove(self):
+        if self._threats is None:
+            return None
+        return self._threats.bestMove(self._my.Value)
+
+    # 没有权重大于0的点可下时的落子：棋盘上还没有棋子时为天元，否则按坐标顺序先取
+    # 候选点、再取其它空位中第一个不是禁手的点，棋盘已满时返回None
+    def anyMove(self):
+        if not self._position.moves:
+            center = self._pointNumber // 2
+            return Point(center, center)
+        empties = [Point(x, y) for y in range(self._pointNumber)
+                   for x in range(self._pointNumber) if self._board.isEmpty(x, y)]
+        for point in sorted(self._candidates) + empties:
+            if not (self._rule.hasForbidden and self.isForbidden(point)):
+                return point
+        return None
+
+    # 判断己方在所给空位落子是否为禁手
+    def isForbidden(self, point):
+        return self._rule.isForbidden(self._board, self._my.Value, point.X, point.Y)
+
+    # 机器落子
+    def machineDrop(self):
+        point = self.bookMove()
+        if point is None:
+            point = self.threatMove()
+        if point is not None and self._rule.hasForbidden and self.isForbidden(point):
+            point = None
+        if point is not None: # 开局库中收录了当前局面，或找到了必胜、必须防守的点
+            return self._commit(point)
+        if not self._candidates: # 棋盘上还没有棋子或已下满
+            return self._commit(self.anyMove())
+        point = None 
+        score = 0
+        # 只遍历周围两格内有棋子的空位，其它空位的权重必为0；按坐标排序保证遍历顺序固定
+        candidates = sorted(self._candidates)
+        if self._rule.hasForbidden: # 有禁手的规则中去掉己方的禁手点
+            candidates = [candidate for candidate in candidates
+                          if not self.isForbidden(candidate)]
+        for candidate in candidates:
+            scoreTemp = sum(self._scores[candidate.Y][candidate.X]) # 读取缓存的落子优先级
+            # 寻找优先级最高的落子位置
+            if scoreTemp > score: 
+                score = scoreTemp
+                point = candidate
+            elif scoreTemp == score and scoreTemp > 0:
+                radius = random.randint(0, 100)
+                if radius % 2 == 0:
+                    point = candidate
+        if point is None: # 候选点的权重都为0或都是禁手
+            point = self.anyMove()
+        return self._commit(point) # 在优先级最高的位置落子，返回其位置信息
\ No newline at end of file
@@ -0,0 +1,225 @@
+#mcts.py
+"""
+Created on Sat Oct 24 10:12:37 2026
+
+Description:基于蒙特卡洛树搜索（UCT）的五子棋AI。节点只展开权重最高的若干个点，
+落子权重（同Machine.getPointScore）归一化后作为选择时的先验；模拟对局在权重最高的
+几个点中按权重随机落子，超过步数仍未分胜负时按双方最佳落子点的权重估计胜率。
+多个工作进程各自从当前局面独立建树（根并行），结束后合并根节点各落子的访问次数
+"""
+import math
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from machine import Machine
+
+CHESSMEN = {BLACK_CHESSMAN.Value: BLACK_CHESSMAN, WHITE_CHESSMAN.Value: WHITE_CHESSMAN}
+
+_cancelEvent = None # 工作进程中的取消事件，由进程池的初始化函数设置
+
+# 进程池的初始化函数：记录主进程的取消事件，置位后工作进程中的建树提前结束
+def _setCancelEvent(event):
+    global _cancelEvent
+    _cancelEvent = event
+
+# 搜索树的节点：value方在point落子后的局面
+class Node:
+    __slots__ = ("point", "value", "prior", "children", "visits", "wins", "won")
+
+    def __init__(self, point, value, prior):
+        self.point = point
+        self.value = value # 落子方
+        self.prior = prior # 先验概率
+        self.children = None # 子节点，未展开时为None
+        self.visits = 0 # 访问次数
+        self.wins = 0.0 # 落子方的累计得分，胜1、和0.5、负0
+        self.won = None # 落子后是否获胜，首次访问时判断
+
+    # 从父节点选择该点的分值：平均得分加上随先验增大、随访问次数减小的探索项
+    def score(self, parentVisits, exploration):
+        if self.visits:
+            mean = self.wins / self.visits
+        else:
+            mean = 0.5
+        return mean + exploration * self.prior * math.sqrt(parentVisits) / (1 + self.visits)
+
+# 一个进程中的搜索：在stones（(x, y, 棋子值)）构成的局面上为value方建树，
+# 最多进行playouts次模拟或用时timeLimit秒，cancel置位时提前结束（为None时使用工作进程
+# 的取消事件），返回根节点各落子的(x, y, 访问次数, 得分)
+def searchTree(pointNumber, stones, value, rule, playouts, timeLimit, seed,
+               width=10, rolloutWidth=3, rolloutDepth=6, exploration=1.5, cancel=None):
+    deadline = perf_counter() + timeLimit
+    if cancel is None:
+        cancel = _cancelEvent
+    generator = random.Random(seed)
+    board = Board(pointNumber, rule)
+    for x, y, stone in stones:
+        board.makeMove(Point(x, y), stone)
+    # 双方视角下的机器，与搜索的棋盘共用，落子和撤销时随之更新权重
+    views = {stoneValue: Machine(pointNumber, chessMan, threatNodes=0, rule=rule, board=board)
+             for stoneValue, chessMan in CHESSMEN.items()}
+
+    # value方权重最高的至多limit个候选点及其权重，棋盘上还没有棋子时只有天元
+    def candidates(value, limit):
+        view = views[value]
+        result = []
+        for score, point in view.getCandidates(ordered=True):
+            if rule.hasForbidden and view.isForbidden(point):
+                continue
+            result.append((score, point))
+            if len(result) == limit:
+                break
+        if not result and not board.moves:
+            center = pointNumber // 2
+            result.append((1, Point(center, center)))
+        return result
+
+    # 展开node，子节点的先验为各点权重所占的比例
+    def expand(node, value):
+        moves = candidates(value, width)
+        total = sum(score for score, point in moves)
+        node.children = [Node(point, value, score / total) for score, point in moves]
+
+    # 从当前局面轮到value方开始模拟，返回胜者的棋子值，和棋返回0；
+    # 超过步数时返回按权重估计的黑方胜率（0到1之间的小数）
+    def rollout(value):
+        made = 0
+        try:
+            for ply in range(rolloutDepth):
+                moves = candidates(value, rolloutWidth)
+                if not moves: # 无处可下
+                    return 0
+                score, point = generator.choices(moves, [score for score, point in moves])[0]
+                board.makeMove(point, value)
+                made += 1
+                if rule.isWin(board.bits, value, point.X, point.Y):
+                    return value
+                value = 3 - value
+            mine = max((score for score, point in views[value].getCandidates()), default=0)
+            theirs = max((score for score, point in views[3 - value].getCandidates()), default=0)
+            if mine + theirs == 0:
+                return 0
+            # 轮到value方落子时的胜率，返回时换算为黑方的胜率
+            rate = mine / (mine + theirs)
+            return rate if value == BLACK_CHESSMAN.Value else 1 - rate
+        finally:
+            for i in range(made):
+                board.unmakeMove()
+
+    root = Node(None, 3 - value, 1.0)
+    count = 0
+    while count < playouts and perf_counter() < deadline \
+        and not (cancel is not None and cancel.is_set()):
+        count += 1
+        node = root
+        path = [root]
+        toMove = value
+        try:
+            # 选择：沿分值最高的子节点走到未展开或已分胜负的节点
+            while node.children and not node.won:
+                parentVisits = node.visits
+                node = max(node.children, key=lambda child: child.score(parentVisits,
+                                                                        exploration))
+                board.makeMove(node.point, node.value)
+                path.append(node)
+                if node.won is None:
+                    node.won = rule.isWin(board.bits, node.value, node.point.X, node.point.Y)
+                toMove = 3 - node.value
+            # 展开及模拟
+            if node.won:
+                result = node.value
+            else:
+                if node.visits > 0 or node is root:
+                    expand(node, toMove)
+                result = rollout(toMove)
+        finally:
+            for i in range(len(path) - 1):
+                board.unmakeMove()
+        # 回传：result为胜者的棋子值、0（和棋）或黑方的估计胜率
+        for visited in path:
+            visited.visits += 1
+            if isinstance(result, float):
+                visited.wins += result if visited.value == BLACK_CHESSMAN.Value else 1 - result
+            elif result == visited.value:
+                visited.wins += 1
+            elif result == 0:
+                visited.wins += 0.5
+    return [(child.point.X, child.point.Y, child.visits, child.wins)
+            for child in root.children or []]
+
+class MCTSMachine(Machine):
+    # 初始化，playouts为每步的模拟次数上限，timeLimit为每步的思考时间（秒），
+    # workers为建树的进程数（默认为CPU核心数，为1时在本进程中搜索），width为每个节点
+    # 展开的点数，rolloutWidth为模拟时从权重最高的几个点中选点，rolloutDepth为模拟的
+    # 最大步数，exploration为探索项的系数，其余参数同Machine
+    def __init__(self, pointNumber, chessMan, playouts=4000, timeLimit=1.0, workers=None,
+                 width=10, rolloutWidth=3, rolloutDepth=6, exploration=1.5, book=None,
+                 threatNodes=0, threatTime=None, rule=None, board=None):
+        super().__init__(pointNumber, chessMan, book, threatNodes, threatTime, rule, board)
+        self._playouts = playouts
+        self._timeLimit = timeLimit
+        self._workers = workers or os.cpu_count()
+        self._parameters = {"width": width, "rolloutWidth": rolloutWidth,
+                            "rolloutDepth": rolloutDepth, "exploration": exploration}
+        self._executor = None # 建树的进程池，首次使用时创建
+        # 停止请求，多进程建树时与工作进程共享
+        if self._workers > 1:
+            self._cancel = multiprocessing.Event()
+        else:
+            self._cancel = threading.Event()
+        self.playouts = 0 # 本步的模拟次数
+
+    # 蒙特卡洛树搜索得到的落子：各进程独立建树，随机数种子取自random模块，
+    # 合并后取访问次数最多的点，次数相同时取坐标最小的点
+    def mctsMove(self):
+        stones = [(point.X, point.Y, self._board.get(point.X, point.Y))
+                  for point in self._position.moves]
+        seed = random.getrandbits(32)
+        share = max(self._playouts // self._workers, 1)
+        arguments = (self._pointNumber, stones, self._my.Value, self._rule, share,
+                     self._timeLimit)
+        if self._workers == 1:
+            results = [searchTree(*arguments, seed, cancel=self._cancel, **self._parameters)]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                     initializer=_setCancelEvent,
+                                                     initargs=(self._cancel,))
+            futures = [self._executor.submit(searchTree, *arguments, seed + index,
+                                             **self._parameters)
+                       for index in range(self._workers)]
+            results = [future.result() for future in futures]
+        visits = {}
+        for result in results:
+            for x, y, count, wins in result:
+                visits[Point(x, y)] = visits.get(Point(x, y), 0) + count
+        self.playouts = sum(visits.values())
+        if not visits: # 根节点没有可展开的点
+            return self.anyMove()
+        return max(sorted(visits), key=lambda point: visits[point])
+
+    # 关闭建树的进程池，不等待正在进行的建树结束
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # 提前结束正在进行的建树（可在其它线程中调用），mctsMove按已有的模拟结果落子
+    def stop(self):
+        self._cancel.set()
+
+    # 机器落子
+    def machineDrop(self):
+        self._cancel.clear() # 新的一步开始时清除上一步结束后才到达的停止请求
+        point = self.bookMove() # 优先使用开局库和威胁空间搜索
+        if point is None:
+            point = self.threatMove()
+        if point is not None and self._rule.hasForbidden and self.isForbidden(point):
+            point = None
+        if point is None:
+            point = self.mctsMove()
+        return self._commit(point)
@@ -0,0 +1,137 @@
+#openingbook.py
+"""
+Created on Wed Oct 21 14:36:52 2026
+
+Description:开局库。局面按规范哈希（八种对称变换下最小的Zobrist哈希，见
+BitBoard.canonicalHash）索引，等价的局面只存一次，每个局面记录规范方向下的推荐落子。
+库文件是开放寻址的散列表，启动时内存映射，查询只需读取少数几条记录；库由selfplay.py输出的对局记录生成
+
+用法：python openingbook.py games.jsonl --output book.bin --plies 12
+"""
+import argparse
+import json
+import mmap
+import struct
+from collections import Counter, defaultdict
+from bitboard import BitBoard, transformPoint, inversePoint
+from board import Point
+
+MAGIC = b"GOBOOK"
+VERSION = 1
+# 文件头：标识、版本、棋盘大小、收录的最大步数、散列表的槽数（2的幂）
+HEADER = struct.Struct("<6sHHHI")
+# 每条记录：规范哈希、推荐落子的x、y、该落子在对局记录中出现的次数；哈希为0表示空槽
+RECORD = struct.Struct("<QBBH")
+
+class OpeningBook:
+    # 以只读方式内存映射开局库文件
+    def __init__(self, path):
+        with open(path, "rb") as bookFile:
+            self._data = mmap.mmap(bookFile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.pointNumber, self.plies, self._capacity = \
+            HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self._data.close()
+            raise ValueError(f"{path}不是开局库文件")
+        self._mask = self._capacity - 1
+
+    # 查询规范哈希key的记录，返回(x, y, 次数)，未收录时返回None
+    def probe(self, key):
+        slot = key & self._mask
+        while True: # 散列表至少有一半空槽，线性探测必然遇到空槽结束
+            stored, x, y, count = RECORD.unpack_from(self._data,
+                                                     HEADER.size + slot * RECORD.size)
+            if stored == key:
+                return x, y, count
+            if stored == 0:
+                return None
+            slot = (slot + 1) & self._mask
+
+    # 返回位棋盘bits上局面的推荐落子，未收录时返回None
+    def lookup(self, bits):
+        if bits.count() >= self.plies:
+            return None
+        key, symmetry = bits.canonicalHash()
+        if key == 0: # 空棋盘不收录
+            return None
+        entry = self.probe(key)
+        if entry is None:
+            return None
+        x, y = inversePoint(symmetry, entry[0], entry[1], self.pointNumber)
+        if not bits.isEmpty(x, y): # 哈希冲突
+            return None
+        return Point(x, y)
+
+    def close(self):
+        self._data.close()
+
+_books = {} # 已打开的开局库，同一进程中的引擎共用
+
+# 按路径打开开局库，同一文件只映射一次
+def loadBook(path):
+    if path not in _books:
+        _books[path] = OpeningBook(path)
+    return _books[path]
+
+# 将entries（规范哈希 -> (x, y, 次数)）写入开局库文件
+def writeBook(path, pointNumber, plies, entries):
+    capacity = 1
+    while capacity < 2 * len(entries): # 装载率不超过一半
+        capacity *= 2
+    slots = [None] * capacity
+    for key, entry in entries.items():
+        slot = key & (capacity - 1)
+        while slots[slot] is not None:
+            slot = (slot + 1) & (capacity - 1)
+        slots[slot] = (key,) + entry
+    with open(path, "wb") as bookFile:
+        bookFile.write(HEADER.pack(MAGIC, VERSION, pointNumber, plies, capacity))
+        for record in slots:
+            bookFile.write(RECORD.pack(*(record or (0, 0, 0, 0))))
+
+# 由对局记录生成开局库条目：统计胜方在前plies步中每个局面下的落子，
+# 取出现次数最多且不少于minCount次的落子；随机开局的步数不计入
+def buildBook(games, pointNumber=15, plies=12, minCount=2):
+    counts = defaultdict(Counter)
+    for game in games:
+        if game["size"] != pointNumber or game["winner"] not in (1, 2):
+            continue
+        bits = BitBoard(pointNumber)
+        for ply, (x, y) in enumerate(game["moves"][:plies]):
+            value = 1 if ply % 2 == 0 else 2 # 黑白交替落子
+            # 只统计胜方的落子，空棋盘（哈希为0）不收录
+            if value == game["winner"] and ply >= max(game.get("opening", 0), 1):
+                key, symmetry = bits.canonicalHash()
+                counts[key][transformPoint(symmetry, x, y, pointNumber)] += 1
+            bits.place(value, x, y)
+    entries = {}
+    for key, moves in counts.items():
+        (x, y), count = moves.most_common(1)[0]
+        if count >= minCount:
+            entries[key] = (x, y, min(count, 0xFFFF))
+    return entries
+
+# 逐行读取selfplay.py输出的JSON行文件
+def readGames(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as gameFile:
+            for line in gameFile:
+                if line.strip():
+                    yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="由自我对弈记录生成五子棋开局库")
+    parser.add_argument("games", nargs="+", help="selfplay.py --output输出的JSON行文件")
+    parser.add_argument("--output", default="book.bin", help="开局库文件")
+    parser.add_argument("--size", type=int, default=15, help="棋盘每行每列的点数")
+    parser.add_argument("--plies", type=int, default=12, help="收录开局的前几步")
+    parser.add_argument("--min-count", type=int, default=2,
+                        help="落子在胜方记录中至少出现的次数")
+    args = parser.parse_args()
+
+    entries = buildBook(readGames(args.games), args.size, args.plies, args.min_count)
+    writeBook(args.output, args.size, args.plies, entries)
+    print(f"共收录{len(entries)}个局面，已写入{args.output}")
+
+if __name__ == "__main__":
+    main()
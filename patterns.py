@@ -0,0 +1,155 @@
+#patterns.py
+"""
+Created on Mon Oct 19 15:48:03 2026
+
+Description:某点在一个方向上的权重只取决于该点两侧各五格内的棋子，
+将两侧各五格编码为整数后查表得到权重，表在导入时按权重划分预先算好
+"""
+
+# 每格的编码：空0、己方1、敌方2、棋盘外3，一侧五格按四进制编码
+EMPTY = 0
+MINE = 1
+RIVAL = 2
+EDGE = 3
+SIDE_CODES = 4 ** 5 # 一侧五格的编码个数
+
+'''
+权重值划分：
+（己方连续四子>敌方连续四子）>（己方连续三子无阻挡>敌方连续三子无阻挡）>（己方连续三子有一个阻挡&&己方连续两子无阻挡
+>敌方连续三子有阻挡&&敌方连续两子无阻挡）>（己方连续两子有阻挡>敌方连续两子有阻挡）
+无空格>有空格，两种情况应在同一数量级（紧跟在括号后）
+优先级量化 8 10 80 100 800 1000 8000 10000 五组（当数值相近的时候会变成人工智障，不知为啥）
+'''
+def patternScore(countSelf, countOpposite, blockSelf, blockOpposite, space):
+    if countSelf == 4: # 若己方连续四子
+        score = 10000
+    elif countOpposite == 4: # 若敌方连续四子
+        score = 8000
+    elif countSelf == 3: # 若我方连续三子
+        if blockSelf == 0: # 若我方连续三子无阻挡
+            score = 1000
+        elif blockSelf == 1: # 若我方连续三子中有一个阻挡
+            score = 100
+        else:
+            score = 0
+    elif countOpposite == 3: # 若敌方连续三子
+        if blockOpposite == 0: # 若敌方连续三子无阻挡
+            score = 800
+        elif blockOpposite == 1: # 若敌方连续三子中有一个阻挡
+            score = 80
+        else:
+            score = 0
+    elif countSelf == 2: # 若己方连续两子
+        if blockSelf == 0:
+            score = 100
+        elif blockSelf == 1:
+            score = 80
+        else:
+            score = 0
+    elif countOpposite == 2: # 若敌方连续两子
+        if blockOpposite == 0:
+            score = 10
+        elif blockOpposite == 1:
+            score = 8
+        else:
+            score = 0
+    elif countSelf == 1: # 若己方只有单个落子
+        score = 10
+    elif countOpposite == 1: # 若对方只有单个落子
+        score = 8
+    else:
+        score = 0
+
+    if space: # 若己方或对方连续棋子内存在空格
+        score //= 2 # 优先级降低（各权重都是偶数，减半后仍为整数）
+
+    return score
+
+# 一侧五格的编码，cells[i]为偏移i+1格处的棋子
+def encodeSide(cells):
+    code = 0
+    for cell in reversed(cells):
+        code = code * 4 + cell
+    return code
+
+# 解码一侧五格
+def decodeSide(code):
+    cells = []
+    for i in range(5):
+        cells.append(code % 4)
+        code //= 4
+    return cells
+
+# 沿一侧统计连续子数、空格和阻挡，state为[countSelf, countOpposite, spaceSelf,
+# spaceOpposite, blockSelf, blockOpposite]，空格状态None、False、True含义同原逐格统计
+def _scanSide(cells, state):
+    countSelf, countOpposite, spaceSelf, spaceOpposite, blockSelf, blockOpposite = state
+    # 如果是 1 表示是边上是我方子，2 表示敌方子， 0表示无子（两格内都没有棋子或越界）
+    if cells[0] in (MINE, RIVAL):
+        flag = cells[0]
+    elif cells[0] == EMPTY and cells[1] in (MINE, RIVAL):
+        flag = cells[1]
+    else:
+        flag = 0
+    if flag != 0:
+        for cell in cells:
+            if cell == EDGE: # 偏移后触碰到棋盘边界
+                if flag == MINE:
+                    blockSelf += 1
+                else:
+                    blockOpposite += 1
+            elif flag == MINE: # 若该偏移方向两格内有我方棋子
+                if cell == MINE:
+                    countSelf += 1
+                    if spaceSelf is False: # 空格出现在我方连续棋子之间
+                        spaceSelf = True
+                elif cell == RIVAL:
+                    blockOpposite += 1
+                    break
+                else:
+                    if spaceSelf is None:
+                        spaceSelf = False
+                    else:
+                        break # 遇到第二个空格退出循环
+            else: # 若该偏移方向上有敌方棋子
+                if cell == MINE:
+                    blockOpposite += 1
+                    break
+                elif cell == RIVAL:
+                    countOpposite += 1
+                    if spaceOpposite is False:
+                        spaceOpposite = True
+                else:
+                    if spaceOpposite is None:
+                        spaceOpposite = False
+                    else:
+                        break
+    return (countSelf, countOpposite, spaceSelf, spaceOpposite, blockSelf, blockOpposite)
+
+# 预先计算权重表：返回(正方向编码对应的表偏移, 权重表)，
+# 某方向的权重为scores[offsets[正方向编码] + 反方向编码]
+def buildTable(scoreFunction=patternScore):
+    states = {} # 正方向统计后的状态，相同状态共用一段表
+    offsets = []
+    for code in range(SIDE_CODES):
+        state = _scanSide(decodeSide(code), (0, 0, None, None, 0, 0))
+        # 正方向统计结束后，不在连续子之间的空格不再计入
+        countSelf, countOpposite, spaceSelf, spaceOpposite, blockSelf, blockOpposite = state
+        state = (countSelf, countOpposite,
+                 None if spaceSelf is False else spaceSelf,
+                 None if spaceOpposite is False else spaceOpposite,
+                 blockSelf, blockOpposite)
+        if state not in states:
+            states[state] = len(states) * SIDE_CODES
+        offsets.append(states[state])
+    scores = [0] * (len(states) * SIDE_CODES)
+    for state, start in states.items():
+        for code in range(SIDE_CODES):
+            countSelf, countOpposite, spaceSelf, spaceOpposite, blockSelf, blockOpposite = \
+                _scanSide(decodeSide(code), state)
+            scores[start + code] = scoreFunction(countSelf, countOpposite,
+                                                 blockSelf, blockOpposite,
+                                                 spaceSelf or spaceOpposite)
+    return offsets, scores
+
+SIDE_OFFSETS, LINE_SCORES = buildTable()
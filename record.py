@@ -0,0 +1,119 @@
+#record.py
+"""
+Created on Thu Oct 22 15:27:09 2026
+
+Description:棋谱的二进制格式及流式读写。每局棋谱为7字节的局头加每步一个字节
+（棋盘超过256个点时每步两个字节），多局首尾相接地追加在同一文件中，读取时逐局
+解析，不需要把整个文件读入内存；另可导出为每局一行的文本
+
+局头：标识b"GR"、棋盘大小、胜者（0和棋，1黑，2白，255未结束）、随机开局步数、步数
+每步：落子位置的序号y*size+x，黑白交替，黑方先行
+
+用法：python record.py games.gbr --text              导出为文本
+      python record.py games.gbr --from-jsonl games.jsonl   由自我对弈的JSON行记录转换
+"""
+import argparse
+import collections
+import json
+import struct
+import sys
+from board import Point
+
+MAGIC = b"GR"
+HEADER = struct.Struct("<2sBBBH") # 标识、棋盘大小、胜者、随机开局步数、步数
+UNFINISHED = 255 # 未结束的对局的胜者
+
+# 一局棋谱：棋盘大小、胜者、随机开局步数、按顺序的落子位置
+GameRecord = collections.namedtuple("GameRecord", ["Size", "Winner", "Opening", "Moves"])
+
+# 每步占用的字节数及格式
+def _moveFormat(pointNumber):
+    if pointNumber * pointNumber > 256:
+        return "<{}H"
+    return "<{}B"
+
+# 将一局棋谱编码为字节串
+def encodeRecord(record):
+    size = record.Size
+    data = HEADER.pack(MAGIC, size, record.Winner, record.Opening, len(record.Moves))
+    indices = [point.Y * size + point.X for point in record.Moves]
+    return data + struct.pack(_moveFormat(size).format(len(indices)), *indices)
+
+# 追加写入棋谱，可作为上下文管理器使用
+class RecordWriter:
+    # append为True时追加到已有文件末尾，否则覆盖
+    def __init__(self, path, append=True):
+        self._file = open(path, "ab" if append else "wb")
+        self.count = 0 # 本次写入的局数
+
+    def write(self, record):
+        self._file.write(encodeRecord(record))
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# 逐局读取棋谱文件，每次只读入一局
+def readRecords(path):
+    with open(path, "rb") as recordFile:
+        while True:
+            header = recordFile.read(HEADER.size)
+            if not header:
+                return
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path}末尾的棋谱不完整")
+            magic, size, winner, opening, count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path}不是棋谱文件或已损坏")
+            moveFormat = struct.Struct(_moveFormat(size).format(count))
+            data = recordFile.read(moveFormat.size)
+            if len(data) < moveFormat.size:
+                raise ValueError(f"{path}末尾的棋谱不完整")
+            moves = [Point(index % size, index // size) for index in moveFormat.unpack(data)]
+            yield GameRecord(size, winner, opening, moves)
+
+# 落子位置的文本表示：列用字母a、b、c……，行用从1开始的数字，如天元为h8
+def formatMove(point):
+    return f"{chr(ord('a') + point.X)}{point.Y + 1}"
+
+# 一局棋谱的文本表示：棋盘大小、胜者、随机开局步数及各步落子，以空格分隔
+def formatRecord(record):
+    return " ".join([str(record.Size), str(record.Winner), str(record.Opening)]
+                    + [formatMove(point) for point in record.Moves])
+
+# 将selfplay.py输出的一局结果转换为棋谱
+def fromSelfPlay(result):
+    return GameRecord(result["size"], result["winner"], result.get("opening", 0),
+                      [Point(x, y) for x, y in result["moves"]])
+
+def main():
+    parser = argparse.ArgumentParser(description="五子棋棋谱的转换与导出")
+    parser.add_argument("records", help="二进制棋谱文件")
+    parser.add_argument("--text", action="store_true", help="以文本形式输出每局棋谱")
+    parser.add_argument("--from-jsonl", nargs="+", metavar="JSONL",
+                        help="将selfplay.py输出的JSON行文件追加转换到棋谱文件")
+    args = parser.parse_args()
+
+    if args.from_jsonl:
+        with RecordWriter(args.records) as writer:
+            for path in args.from_jsonl:
+                with open(path, encoding="utf-8") as gameFile:
+                    for line in gameFile:
+                        if line.strip():
+                            writer.write(fromSelfPlay(json.loads(line)))
+        print(f"已追加{writer.count}局棋谱到{args.records}", file=sys.stderr)
+    if args.text:
+        for record in readRecords(args.records):
+            print(formatRecord(record))
+
+if __name__ == "__main__":
+    main()
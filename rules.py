@@ -0,0 +1,113 @@
+#rules.py
+"""
+Created on Fri Oct 23 14:18:50 2026
+
+Description:五子棋的规则变体。无禁手规则五子及以上连珠获胜；标准规则恰好五子
+连珠获胜，长连不算；连珠规则（Renju）黑方恰好五子获胜，长连、双四、双三为禁手，
+白方五子及以上获胜。各规则的胜负判断直接调用位棋盘上对应的判断，不逐格分支
+"""
+from bitboard import DIRECTIONS
+
+# 无禁手：五子及以上连珠获胜
+class FreestyleRule:
+    name = "freestyle"
+    overlineWins = True # 长连是否获胜
+    hasForbidden = False # 是否有禁手
+
+    # 判断value方在(x, y)落子后是否获胜，bits为已落子的位棋盘
+    def isWin(self, bits, value, x, y):
+        return bits.isFive(value, x, y)
+
+    # 判断value方在空位(x, y)落子是否为禁手
+    def isForbidden(self, bits, value, x, y):
+        return False
+
+# 标准规则：恰好五子连珠获胜，长连不算获胜
+class StandardRule(FreestyleRule):
+    name = "standard"
+    overlineWins = False
+
+    def isWin(self, bits, value, x, y):
+        return bits.isExactFive(value, x, y)
+
+# 沿(dx, dy)所在的线上能与(x, y)处的棋子组成恰好五连的空位相对该点的偏移
+def _fiveCompletions(bits, value, x, y, dx, dy, pointNumber):
+    completions = []
+    for i in range(-4, 5):
+        completeX = x + i * dx
+        completeY = y + i * dy
+        if 0 <= completeX < pointNumber and 0 <= completeY < pointNumber \
+            and bits.isEmpty(completeX, completeY):
+            bits.place(value, completeX, completeY)
+            if bits.hasExactFive(value, x, y, dx, dy):
+                completions.append(i)
+            bits.remove(completeX, completeY)
+    return completions
+
+# (x, y)处的棋子沿(dx, dy)所在的线上组成的四的个数：活四（两端都能成五）算一个，
+# 同一条线上不相干的两个四算两个
+def _countFours(bits, value, x, y, dx, dy, pointNumber):
+    completions = _fiveCompletions(bits, value, x, y, dx, dy, pointNumber)
+    if len(completions) == 2 and completions[1] - completions[0] == 5:
+        return 1
+    return len(completions)
+
+# (x, y)处的棋子沿(dx, dy)所在的线上是否组成活三：再下一手能成为包含该点的活四
+def _isOpenThree(bits, value, x, y, dx, dy, pointNumber):
+    for i in range(-4, 5):
+        nextX = x + i * dx
+        nextY = y + i * dy
+        if i == 0 or not (0 <= nextX < pointNumber and 0 <= nextY < pointNumber) \
+            or not bits.isEmpty(nextX, nextY):
+            continue
+        bits.place(value, nextX, nextY)
+        completions = _fiveCompletions(bits, value, x, y, dx, dy, pointNumber)
+        bits.remove(nextX, nextY)
+        if len(completions) == 2 and completions[1] - completions[0] == 5:
+            return True
+    return False
+
+# 连珠规则：黑方恰好五子获胜，长连、双四、双三为禁手；白方五子及以上获胜
+class RenjuRule(StandardRule):
+    name = "renju"
+    hasForbidden = True
+
+    def isWin(self, bits, value, x, y):
+        if value == 1:
+            return bits.isExactFive(value, x, y)
+        return bits.isFive(value, x, y)
+
+    # 黑方落子后形成五连时不算禁手；否则长连、两个及以上的四、两个及以上的活三为禁手。
+    # 活三只按下一手能否成活四判断，不再递归判断成活四的点本身是否为禁手。
+    # 已有棋子的点不是禁手（判断时会试放再移除该点的棋子，不能用于非空的点）
+    def isForbidden(self, bits, value, x, y):
+        if value != 1 or not bits.isEmpty(x, y):
+            return False
+        pointNumber = bits.pointNumber
+        bits.place(value, x, y)
+        try:
+            if bits.isExactFive(value, x, y):
+                return False
+            fours = 0
+            threes = 0
+            for dx, dy in DIRECTIONS:
+                if bits.hasOverline(value, x, y, dx, dy):
+                    return True
+                count = _countFours(bits, value, x, y, dx, dy, pointNumber)
+                fours += count
+                if count == 0 and _isOpenThree(bits, value, x, y, dx, dy, pointNumber):
+                    threes += 1
+            return fours >= 2 or threes >= 2
+        finally:
+            bits.remove(x, y)
+
+# 规则名称与类的对应关系
+RULES = {"freestyle": FreestyleRule,
+         "standard": StandardRule,
+         "renju": RenjuRule}
+
+# 按名称创建规则
+def createRule(name):
+    if name not in RULES:
+        raise ValueError(f"未知的规则：{name}，可选：{', '.join(RULES)}")
+    return RULES[name]()
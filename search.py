@@ -0,0 +1,287 @@
+#search.py
+"""
+Created on Sun Oct 18 14:20:41 2026
+
+Description:基于负极大值搜索的五子棋AI，使用alpha-beta剪枝和迭代加深，
+在限定时间内尽可能搜索更深的层数；可将根节点的候选点分给多个进程并行搜索
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from machine import Machine
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+WIN_SCORE = 1000000000 # 五子连珠的分值，远大于任何局面评估值
+# 局面评估中对方最佳落子点权重的系数：权重中已含防守的分值，对方冲四时行棋方的
+# 最佳点即挡住它的点，行棋方先走一步，对方的威胁减半计算，否则搜索会高估无用的冲四
+RIVAL_WEIGHT = 0.5
+
+# 搜索超时时抛出，用于从递归中直接退出
+class SearchTimeout(Exception):
+    pass
+
+_cancelEvent = None # 工作进程中的取消事件，由进程池的初始化函数设置
+
+# 进程池的初始化函数：记录主进程的取消事件，置位后工作进程中的搜索提前结束
+def _setCancelEvent(event):
+    global _cancelEvent
+    _cancelEvent = event
+
+# 在工作进程中搜索根节点的部分候选点：按stones（(x, y, 棋子值)）重建局面，
+# 以value方对moves（(x, y)）迭代加深，options为SearchMachine的搜索参数，
+# 返回各层完成时的(层数, x, y, 分值)及搜索的节点数
+def searchRootMoves(pointNumber, stones, value, rule, moves, options):
+    board = Board(pointNumber, rule)
+    for x, y, stone in stones:
+        board.makeMove(Point(x, y), stone)
+    if value == BLACK_CHESSMAN.Value:
+        chessMan = BLACK_CHESSMAN
+    else:
+        chessMan = WHITE_CHESSMAN
+    engine = SearchMachine(pointNumber, chessMan, threatNodes=0, rule=rule, board=board,
+                           **options)
+    engine._cancel = _cancelEvent
+    results = engine.deepen([Point(x, y) for x, y in moves])
+    return [(depth, point.X, point.Y, score) for depth, point, score in results], engine.nodes
+
+class SearchMachine(Machine):
+    # 初始化，timeLimit为每步的思考时间（秒），minDepth、maxDepth为迭代加深的
+    # 起止层数，width为每层只展开权重最高的若干个点，tableMemory为置换表的内存上限（字节），
+    # workers为并行搜索根节点的进程数，为1时在本进程中搜索，其余参数同Machine
+    def __init__(self, pointNumber, chessMan, timeLimit=1.0,
+                 minDepth=3, maxDepth=8, width=8, tableMemory=16 * 1024 * 1024, book=None,
+                 threatNodes=0, threatTime=None, rule=None, board=None, workers=1):
+        super().__init__(pointNumber, chessMan, book, threatNodes, threatTime, rule, board)
+        # 工作进程中的搜索参数
+        self._options = {"timeLimit": timeLimit, "minDepth": minDepth, "maxDepth": maxDepth,
+                         "width": width, "tableMemory": tableMemory}
+        self._workers = workers
+        self._executor = None # 并行搜索的进程池，首次使用时创建
+        self._cancel = None # 并行搜索时与工作进程共享的取消事件，随进程池创建
+        self._timeLimit = timeLimit
+        # 一两层的搜索只看到对手的应对而看不到己方的后续手段，
+        # 结果不如直接取权重最高的点，因此迭代加深从minDepth开始
+        self._minDepth = minDepth
+        self._maxDepth = maxDepth
+        self._width = width
+        self.table = TranspositionTable(tableMemory) # 置换表，跨步保留
+        # 以对手为己方的机器，用于得到对手视角下的落子权重；与本机共用棋盘，随之更新
+        self._shadow = Machine(pointNumber, self._rival, threatNodes=0, rule=self._rule,
+                               board=self._position)
+        self._deadline = 0 # 本步搜索的截止时间
+        self._stopped = False # 是否被要求提前结束本步搜索
+        self.nodes = 0 # 本步搜索的节点数
+        self.depth = 0 # 本步完成的搜索层数
+
+    # 返回value方视角下的机器
+    def _view(self, value):
+        if value == self._my.Value:
+            return self
+        return self._shadow
+
+    # 返回value方的对手的棋子值
+    def _other(self, value):
+        if value == self._my.Value:
+            return self._rival.Value
+        return self._my.Value
+
+    # value方按权重从高到低排序的候选落子点，只保留前width个
+    def orderMoves(self, value):
+        view = self._view(value)
+        candidates = view.getCandidates(ordered=True)
+        if self._rule.hasForbidden: # 有禁手的规则中去掉禁手点
+            candidates = [(score, point) for score, point in candidates
+                          if not view.isForbidden(point)]
+        return [point for score, point in candidates[:self._width]]
+
+    # 以value方为行棋方的局面评估：value方视角下最佳落子点的权重减去对方视角下
+    # 最佳落子点的权重乘以RIVAL_WEIGHT
+    def evaluate(self, value):
+        mine = max((score for score, point in self._view(value).getCandidates()), default=0)
+        theirs = max((score for score, point in self._view(self._other(value)).getCandidates()),
+                     default=0)
+        return mine - RIVAL_WEIGHT * theirs
+
+    # 负极大值搜索，返回value方为行棋方时局面的分值
+    def _negamax(self, depth, ply, alpha, beta, value):
+        self.nodes += 1
+        # 每个节点的开销远大于读时钟和取消事件，每次都检查
+        if self._stopped or perf_counter() > self._deadline \
+            or (self._cancel is not None and self._cancel.is_set()):
+            raise SearchTimeout()
+        if depth == 0:
+            return self.evaluate(value)
+        key = self._board.hash
+        alphaOrigin = alpha
+        tableMove = -1
+        entry = self.table.probe(key)
+        if entry is not None:
+            tableDepth, flag, score, tableMove = entry
+            if tableDepth >= depth: # 置换表中的结果足够深时直接使用
+                if flag == EXACT:
+                    return score
+                elif flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+        moves = self.orderMoves(value)
+        if not moves: # 无处可下，视为和棋
+            return 0
+        if tableMove >= 0: # 优先搜索置换表记录的最佳点
+            point = Point(tableMove % self._pointNumber, tableMove // self._pointNumber)
+            if point in moves:
+                moves.remove(point)
+            moves.insert(0, point)
+        best = -WIN_SCORE
+        bestPoint = moves[0]
+        for point in moves:
+            self.makeMove(point, value)
+            try:
+                if self._rule.isWin(self._board, value, point.X, point.Y): # 越早获胜分值越高
+                    score = WIN_SCORE - ply
+                else:
+                    score = -self._negamax(depth - 1, ply + 1, -beta, -alpha,
+                                           self._other(value))
+            finally: # 超时也要恢复棋盘
+                self.unmakeMove(point)
+            if score > best:
+                best = score
+                bestPoint = point
+            if best > alpha:
+                alpha = best
+            if alpha >= beta: # 剪枝
+                break
+        if best <= alphaOrigin:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, depth, flag, best,
+                         bestPoint.Y * self._pointNumber + bestPoint.X)
+        return best
+
+    # 在根节点搜索depth层，返回最佳落子点及分值，moves为按优先顺序排列的根节点候选点
+    def _searchRoot(self, depth, moves):
+        alpha = -WIN_SCORE - 1
+        bestPoint = moves[0]
+        for point in moves:
+            self.makeMove(point, self._my.Value)
+            try:
+                if self._rule.isWin(self._board, self._my.Value, point.X, point.Y):
+                    score = WIN_SCORE
+                else:
+                    score = -self._negamax(depth - 1, 1, -WIN_SCORE - 1, -alpha,
+                                           self._rival.Value)
+            finally: # 超时也要恢复棋盘
+                self.unmakeMove(point)
+            if score > alpha:
+                alpha = score
+                bestPoint = point
+        return bestPoint, alpha
+
+    # 对根节点的候选点moves迭代加深，在时间限制内返回各层完成时的(层数, 最佳点, 分值)
+    def deepen(self, moves):
+        moves = list(moves)
+        self._deadline = perf_counter() + self._timeLimit
+        results = []
+        for depth in range(self._minDepth, self._maxDepth + 1):
+            try:
+                point, score = self._searchRoot(depth, moves)
+            except SearchTimeout:
+                break
+            results.append((depth, point, score))
+            # 下一层优先搜索本层的最佳点
+            moves.remove(point)
+            moves.insert(0, point)
+            if abs(score) >= WIN_SCORE - self._maxDepth: # 已找到必胜或必败
+                break
+        return results
+
+    # 将根节点的候选点轮流分给各进程，每个进程在局面的副本上独立迭代加深。
+    # 合并时取各进程都完成的最深一层，比较各进程在该层的最佳分值，分值相同时取
+    # moves中靠前的点，结果只取决于局面和各进程完成的层数，与进程完成的先后无关。
+    # 有进程在最浅一层就超时时，它分到的点都没有结果，与单进程搜索一样返回空列表
+    def _parallelSearch(self, moves):
+        if self._executor is None:
+            self._cancel = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 initializer=_setCancelEvent,
+                                                 initargs=(self._cancel,))
+        if self._stopped: # 停止请求早于本次提交
+            self._cancel.set()
+        stones = [(point.X, point.Y, self._board.get(point.X, point.Y))
+                  for point in self._position.moves]
+        futures = [self._executor.submit(searchRootMoves, self._pointNumber, stones,
+                                         self._my.Value, self._rule,
+                                         [(point.X, point.Y) for point in moves[index::self._workers]],
+                                         self._options)
+                   for index in range(min(self._workers, len(moves)))]
+        finished = []
+        for future in futures:
+            results, nodes = future.result()
+            self.nodes += nodes
+            finished.append(results)
+        if not all(finished):
+            return []
+        depth = min(results[-1][0] for results in finished)
+        best = None
+        for results in finished:
+            for resultDepth, x, y, score in results:
+                if resultDepth == depth:
+                    point = Point(x, y)
+                    if best is None or score > best[2] \
+                        or (score == best[2] and moves.index(point) < moves.index(best[1])):
+                        best = (depth, point, score)
+        return [best]
+
+    # 迭代加深搜索，在时间限制内返回最深一层搜索完成时的最佳落子点
+    def searchMove(self):
+        self.nodes = 0
+        self.depth = 0
+        moves = self.orderMoves(self._my.Value)
+        if not moves: # 棋盘上还没有棋子，或没有权重大于0的点
+            return self.anyMove()
+        try:
+            if self._workers > 1 and len(moves) > 1:
+                results = self._parallelSearch(moves)
+            else:
+                results = self.deepen(moves)
+        finally: # 停止请求只作用于本步
+            self._stopped = False
+            if self._cancel is not None:
+                self._cancel.clear()
+        if not results: # 超时时至少返回权重最高的点
+            return moves[0]
+        self.depth, bestPoint, score = results[-1]
+        return bestPoint
+
+    # 关闭并行搜索的进程池
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # 提前结束正在进行的搜索（可在其它线程中调用），searchMove返回已完成层数的最佳点
+    def stop(self):
+        self._stopped = True
+        if self._cancel is not None: # 通知工作进程
+            self._cancel.set()
+
+    # 机器落子
+    def machineDrop(self):
+        # 新的一步开始时清除上一步结束后才到达的停止请求
+        self._stopped = False
+        if self._cancel is not None:
+            self._cancel.clear()
+        point = self.bookMove() # 优先使用开局库和威胁空间搜索
+        if point is None:
+            point = self.threatMove()
+        if point is not None and self._rule.hasForbidden and self.isForbidden(point):
+            point = None
+        if point is None:
+            point = self.searchMove()
+        return self._commit(point)
@@ -0,0 +1,139 @@
+#selfplay.py
+"""
+Created on Tue Oct 20 11:02:53 2026
+
+Description:无界面的批量自我对弈，用进程池在所有CPU核心上同时进行多局
+AI对战，用于回归测试AI的棋力。每局结果以JSON行的形式输出
+
+用法：python selfplay.py --games 1000 --player1 machine --player2 random
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from engines import ENGINES, createEngine
+from record import RecordWriter, fromSelfPlay
+from rules import RULES, createRule
+
+# 下一个执子方
+def getNextRunner(currentRunner):
+    if currentRunner == BLACK_CHESSMAN:
+        return WHITE_CHESSMAN
+    else:
+        return BLACK_CHESSMAN
+
+# 进行一局对弈，black、white为双方引擎名称，seed为本局的随机数种子，
+# opening为开局时在天元附近随机落子的步数，options为各引擎的构造参数，rule为规则名称
+def playGame(black, white, pointNumber=15, seed=0, opening=2, options=None,
+             rule="freestyle"):
+    options = options or {}
+    random.seed(seed) # 每局单独设定种子，结果与分配到哪个进程无关
+    gameRule = createRule(rule)
+    board = Board(pointNumber, gameRule)
+    # 双方引擎与对局共用棋盘，每步只由对局落子一次
+    players = {BLACK_CHESSMAN: createEngine(black, pointNumber, BLACK_CHESSMAN, rule=gameRule,
+                                            board=board, **options.get(black, {})),
+               WHITE_CHESSMAN: createEngine(white, pointNumber, WHITE_CHESSMAN, rule=gameRule,
+                                            board=board, **options.get(white, {}))}
+    currentRunner = BLACK_CHESSMAN
+    winner = None
+    moves = []
+    center = pointNumber // 2
+    while winner is None: # 和棋时dropChess返回DRAW
+        if len(moves) < opening: # 随机开局
+            point = Point(center + random.randint(-2, 2), center + random.randint(-2, 2))
+            if not board.ifDropChess(point):
+                continue
+        else:
+            point = players[currentRunner].machineDrop()
+        winner = board.dropChess(currentRunner, point)
+        moves.append([point.X, point.Y])
+        currentRunner = getNextRunner(currentRunner)
+    return {"seed": seed,
+            "black": black,
+            "white": white,
+            "size": pointNumber,
+            "rule": rule,
+            "winner": winner.Value, # 0表示和棋
+            "opening": opening,
+            "moves": moves}
+
+# 用进程池进行games局对弈，双方引擎每局交换先后手，逐局产出结果
+def runGames(player1, player2, games, workers=None, pointNumber=15, seed=0,
+             opening=2, options=None, rule="freestyle"):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for index in range(games):
+            if index % 2 == 0:
+                black, white = player1, player2
+            else:
+                black, white = player2, player1
+            futures.append(executor.submit(playGame, black, white, pointNumber,
+                                           seed + index, opening, options, rule))
+        for future in as_completed(futures):
+            yield future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="五子棋AI批量自我对弈")
+    parser.add_argument("--games", type=int, default=100, help="对弈局数")
+    parser.add_argument("--player1", default="machine", choices=sorted(ENGINES),
+                        help="引擎1，偶数局执黑")
+    parser.add_argument("--player2", default="machine", choices=sorted(ENGINES),
+                        help="引擎2，奇数局执黑")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="进程数，默认为CPU核心数")
+    parser.add_argument("--size", type=int, default=15, help="棋盘每行每列的点数")
+    parser.add_argument("--seed", type=int, default=0, help="第一局的随机数种子")
+    parser.add_argument("--opening", type=int, default=2, help="随机开局的步数")
+    parser.add_argument("--rule", default="freestyle", choices=sorted(RULES),
+                        help="规则：freestyle无禁手，standard恰好五连，renju黑方有禁手")
+    parser.add_argument("--time-limit", type=float, default=1.0,
+                        help="search和mcts引擎每步的思考时间（秒）")
+    parser.add_argument("--output", help="逐局结果的输出文件（JSON行），默认不保存")
+    parser.add_argument("--record", help="逐局追加写入的二进制棋谱文件，默认不保存")
+    parser.add_argument("--book", help="machine、search和mcts引擎使用的开局库文件")
+    args = parser.parse_args()
+
+    # 对局已分配到各进程，mcts引擎在本进程中建树
+    options = {"machine": {}, "search": {"timeLimit": args.time_limit},
+               "mcts": {"timeLimit": args.time_limit, "workers": 1}}
+    if args.book:
+        options["machine"]["book"] = args.book
+        options["search"]["book"] = args.book
+        options["mcts"]["book"] = args.book
+    wins = {args.player1: 0, args.player2: 0}
+    draws = 0
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    recorder = RecordWriter(args.record) if args.record else None
+    start = time.perf_counter()
+    try:
+        for result in runGames(args.player1, args.player2, args.games, args.workers,
+                               args.size, args.seed, args.opening, options, args.rule):
+            if result["winner"] == BLACK_CHESSMAN.Value:
+                wins[result["black"]] += 1
+            elif result["winner"] == WHITE_CHESSMAN.Value:
+                wins[result["white"]] += 1
+            else:
+                draws += 1
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+            if recorder is not None:
+                recorder.write(fromSelfPlay(result))
+    finally:
+        if output is not None:
+            output.close()
+        if recorder is not None:
+            recorder.close()
+    elapsed = time.perf_counter() - start
+    print(f"共{args.games}局，用时{elapsed:.1f}秒（每小时{args.games / elapsed * 3600:.0f}局）")
+    if args.player1 == args.player2:
+        print(f"{args.player1}胜{sum(wins.values())}局，和{draws}局")
+    else:
+        print(f"{args.player1}胜{wins[args.player1]}局，"
+              f"{args.player2}胜{wins[args.player2]}局，和{draws}局")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#server.py
+"""
+Created on Wed Oct 21 09:12:35 2026
+
+Description:基于asyncio的五子棋对局服务器，一个进程同时承载大量对局，支持人人对战
+和人机对战，电脑落子交给进程池计算，事件循环始终保持响应
+
+协议：TCP连接上每行一个JSON对象（UTF-8）
+    客户端 -> 服务器
+        {"type": "create", "mode": "human"|"machine", "size": 15, "engine": "machine"}
+                                   创建对局，创建者执黑；人机对局中电脑执白
+        {"type": "list"}           列出等待第二位玩家加入的人人对局
+        {"type": "join", "game": 1}    加入人人对局，执白
+        {"type": "move", "x": 7, "y": 7}   在当前对局中落子
+        {"type": "leave"}          离开当前对局
+    服务器 -> 客户端
+        {"type": "created", "game": 1, "value": 1}
+        {"type": "games", "games": [1, 2]}
+        {"type": "joined", "game": 1, "value": 2}
+        {"type": "start", "game": 1}       双方到齐，黑方开始落子
+        {"type": "move", "x": 7, "y": 7, "value": 1}   任意一方落子，发给对局双方
+        {"type": "over", "winner": 1}      对局结束，winner为0表示和棋
+        {"type": "left", "game": 1}        对手离开，对局结束
+        {"type": "error", "message": "..."}
+
+用法：python server.py --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from engines import ENGINES, createEngine
+
+CHESSMEN = {BLACK_CHESSMAN.Value: BLACK_CHESSMAN, WHITE_CHESSMAN.Value: WHITE_CHESSMAN}
+
+# 客户端请求有误时抛出，内容作为错误信息返回给客户端
+class ProtocolError(Exception):
+    pass
+
+# 在工作进程中计算电脑落子：按落子记录重建引擎后落子，返回(x, y)。
+# 引擎不跨请求保存，因此任何工作进程都能处理任何对局
+def computeMove(name, pointNumber, value, moves, options):
+    engine = createEngine(name, pointNumber, CHESSMEN[value], **options)
+    for index, (x, y) in enumerate(moves): # 黑白交替落子
+        if index % 2 == 0:
+            engine.makeMove(Point(x, y), BLACK_CHESSMAN.Value)
+        else:
+            engine.makeMove(Point(x, y), WHITE_CHESSMAN.Value)
+    point = engine.machineDrop()
+    return point.X, point.Y
+
+# 一局对局的状态
+class Session:
+    def __init__(self, gameId, pointNumber, mode, engine):
+        self.id = gameId
+        self.pointNumber = pointNumber
+        self.mode = mode # "human"为人人对战，"machine"为人机对战
+        self.engine = engine # 人机对战中电脑使用的引擎名称
+        self.board = Board(pointNumber)
+        self.players = {} # 棋子值 -> 玩家连接，人机对战中电脑不占位置
+        self.moves = [] # 按顺序记录的落子[x, y]
+        self.currentRunner = BLACK_CHESSMAN # 当前执子方
+        self.over = False # 对局是否已结束
+
+    # 人人对局是否在等待第二位玩家
+    @property
+    def waiting(self):
+        return self.mode == "human" and len(self.players) == 1 and not self.over
+
+    # 落子，返回胜者的棋子值，未分胜负时返回None，和棋时返回0
+    def drop(self, point):
+        winner = self.board.dropChess(self.currentRunner, point)
+        self.moves.append([point.X, point.Y])
+        if winner is not None: # 和棋时为DRAW，值为0
+            self.over = True
+            return winner.Value
+        if self.currentRunner == BLACK_CHESSMAN:
+            self.currentRunner = WHITE_CHESSMAN
+        else:
+            self.currentRunner = BLACK_CHESSMAN
+        return None
+
+# 一个玩家连接
+class Connection:
+    def __init__(self, writer):
+        self._writer = writer
+        self.session = None # 所在对局
+        self.value = 0 # 在对局中的棋子值
+
+    # 发送一条消息，写入缓冲后等待发送，避免慢客户端占用过多内存
+    async def send(self, message):
+        if self._writer.is_closing():
+            return
+        self._writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+
+class GameServer:
+    # workers为计算电脑落子的进程数，options为各引擎的构造参数
+    def __init__(self, workers=None, options=None):
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._options = options or {}
+        self._sessions = {} # 对局编号 -> 对局
+        self._ids = itertools.count(1)
+
+    # 处理一个客户端连接
+    async def handle(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: # 客户端断开
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ProtocolError("消息必须是JSON对象")
+                    await self._dispatch(connection, message)
+                except (ValueError, ProtocolError) as error:
+                    await connection.send({"type": "error", "message": str(error)})
+        except ConnectionError:
+            pass
+        finally:
+            await self._leave(connection)
+            writer.close()
+
+    async def _dispatch(self, connection, message):
+        kind = message.get("type")
+        if kind == "create":
+            await self._create(connection, message)
+        elif kind == "list":
+            games = [session.id for session in self._sessions.values() if session.waiting]
+            await connection.send({"type": "games", "games": games})
+        elif kind == "join":
+            await self._join(connection, message)
+        elif kind == "move":
+            await self._move(connection, message)
+        elif kind == "leave":
+            await self._leave(connection)
+        else:
+            raise ProtocolError(f"未知的消息类型：{kind}")
+
+    async def _create(self, connection, message):
+        await self._leave(connection)
+        mode = message.get("mode", "machine")
+        if mode not in ("human", "machine"):
+            raise ProtocolError(f"未知的对局模式：{mode}")
+        pointNumber = message.get("size", 15)
+        if not isinstance(pointNumber, int) or not 5 <= pointNumber <= 25:
+            raise ProtocolError("棋盘大小应在5到25之间")
+        engine = message.get("engine", "machine")
+        if not isinstance(engine, str) or engine not in ENGINES:
+            raise ProtocolError(f"未知的引擎：{engine}")
+        session = Session(next(self._ids), pointNumber, mode, engine)
+        self._sessions[session.id] = session
+        session.players[BLACK_CHESSMAN.Value] = connection
+        connection.session = session
+        connection.value = BLACK_CHESSMAN.Value
+        await connection.send({"type": "created", "game": session.id,
+                               "value": BLACK_CHESSMAN.Value})
+        if mode == "machine": # 人机对局无需等待
+            await connection.send({"type": "start", "game": session.id})
+
+    async def _join(self, connection, message):
+        gameId = message.get("game")
+        if not isinstance(gameId, int): # 不可哈希的值不能用于查找对局
+            raise ProtocolError("对局编号应为整数")
+        session = self._sessions.get(gameId)
+        if session is None or not session.waiting:
+            raise ProtocolError("对局不存在或已满")
+        if session is connection.session: # 离开后对局即结束，不能加入自己创建的对局
+            raise ProtocolError("不能加入自己创建的对局")
+        await self._leave(connection)
+        session.players[WHITE_CHESSMAN.Value] = connection
+        connection.session = session
+        connection.value = WHITE_CHESSMAN.Value
+        await connection.send({"type": "joined", "game": session.id,
+                               "value": WHITE_CHESSMAN.Value})
+        await self._broadcast(session, {"type": "start", "game": session.id})
+
+    async def _move(self, connection, message):
+        session = connection.session
+        if session is None:
+            raise ProtocolError("尚未加入对局")
+        if session.over:
+            raise ProtocolError("对局已结束")
+        if session.waiting:
+            raise ProtocolError("等待对手加入")
+        if session.currentRunner.Value != connection.value:
+            raise ProtocolError("还未轮到您落子")
+        x, y = message.get("x"), message.get("y")
+        if not isinstance(x, int) or not isinstance(y, int) \
+                or not (0 <= x < session.pointNumber and 0 <= y < session.pointNumber):
+            raise ProtocolError("落子位置超出了棋盘区域")
+        point = Point(x, y)
+        if not session.board.ifDropChess(point):
+            raise ProtocolError("该位置已有棋子")
+        await self._play(session, point)
+        if session.mode == "machine" and not session.over:
+            await self._machineMove(session)
+
+    # 在对局中落子并通知双方
+    async def _play(self, session, point):
+        value = session.currentRunner.Value
+        winner = session.drop(point)
+        await self._broadcast(session, {"type": "move", "x": point.X, "y": point.Y,
+                                        "value": value})
+        if winner is not None:
+            await self._broadcast(session, {"type": "over", "winner": winner})
+            self._sessions.pop(session.id, None)
+
+    # 在进程池中计算电脑落子，计算期间事件循环继续处理其它对局
+    async def _machineMove(self, session):
+        loop = asyncio.get_running_loop()
+        x, y = await loop.run_in_executor(self._executor, computeMove, session.engine,
+                                          session.pointNumber, session.currentRunner.Value,
+                                          list(session.moves),
+                                          self._options.get(session.engine, {}))
+        if session.over or session.id not in self._sessions: # 玩家已离开
+            return
+        await self._play(session, Point(x, y))
+
+    # 离开当前对局，对局随之结束并通知对手
+    async def _leave(self, connection):
+        session = connection.session
+        if session is None:
+            return
+        connection.session = None
+        session.players.pop(connection.value, None)
+        self._sessions.pop(session.id, None)
+        if not session.over:
+            session.over = True
+            await self._broadcast(session, {"type": "left", "game": session.id})
+
+    async def _broadcast(self, session, message):
+        for player in list(session.players.values()):
+            await player.send(message)
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+async def serve(host, port, workers=None, options=None):
+    gameServer = GameServer(workers, options)
+    server = await asyncio.start_server(gameServer.handle, host, port)
+    print(f"五子棋服务器已启动：{', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        gameServer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="五子棋对局服务器")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="计算电脑落子的进程数，默认为CPU核心数")
+    parser.add_argument("--time-limit", type=float, default=1.0,
+                        help="search和mcts引擎每步的思考时间（秒）")
+    args = parser.parse_args()
+    # 落子已在进程池中计算，mcts引擎在工作进程中直接建树
+    options = {"search": {"timeLimit": args.time_limit},
+               "mcts": {"timeLimit": args.time_limit, "workers": 1}}
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, options))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
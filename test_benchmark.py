@@ -0,0 +1,21 @@
+#test_benchmark.py
+"""
+Created on Mon Oct 26 09:12:40 2026
+
+Description:基准测试局面的回归检查，可用pytest运行，也可直接运行本文件
+"""
+import random
+from benchmark import POSITIONS, makePosition
+
+# 同一种子生成的局面不随全局随机状态变化，保证与保存的结果对比的是同一局面
+def testPositionsRepeat():
+    for seed, stones in POSITIONS.values():
+        random.seed()
+        first = makePosition(15, stones, seed)
+        random.seed()
+        assert makePosition(15, stones, seed) == first
+        assert len(first) == stones
+
+if __name__ == "__main__":
+    testPositionsRepeat()
+    print("全部通过")
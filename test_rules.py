@@ -0,0 +1,55 @@
+#test_rules.py
+"""
+Created on Sun Oct 25 10:02:14 2026
+
+Description:规则变体的回归检查，可用pytest运行，也可直接运行本文件
+"""
+from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from rules import createRule
+
+# 在renju规则的棋盘上按顺序放置棋子，stones为(棋子, x, y)
+def renjuBoard(stones):
+    board = Board(15, createRule("renju"))
+    for chessMan, x, y in stones:
+        board.makeMove(Point(x, y), chessMan.Value)
+    return board
+
+# 双三、双四、长连为禁手，同时成五时不算禁手
+def testRenjuForbidden():
+    board = renjuBoard([(BLACK_CHESSMAN, 6, 7), (BLACK_CHESSMAN, 8, 7),
+                        (BLACK_CHESSMAN, 7, 6), (BLACK_CHESSMAN, 7, 8)])
+    assert board.isForbidden(BLACK_CHESSMAN, Point(7, 7)) # 双三
+    assert not board.isForbidden(WHITE_CHESSMAN, Point(7, 7))
+    board = renjuBoard([(BLACK_CHESSMAN, x, 7) for x in (4, 5, 6)]
+                       + [(BLACK_CHESSMAN, 7, y) for y in (4, 5, 6)])
+    assert board.isForbidden(BLACK_CHESSMAN, Point(7, 7)) # 双四
+    board = renjuBoard([(BLACK_CHESSMAN, x, 7) for x in (2, 3, 4, 6, 7)])
+    assert board.isForbidden(BLACK_CHESSMAN, Point(5, 7)) # 长连
+    board = renjuBoard([(BLACK_CHESSMAN, x, 7) for x in (3, 4, 5, 6)]
+                       + [(BLACK_CHESSMAN, 7, y) for y in (8, 9)]
+                       + [(BLACK_CHESSMAN, 8, 6), (BLACK_CHESSMAN, 9, 5)])
+    assert not board.isForbidden(BLACK_CHESSMAN, Point(7, 7)) # 成五优先
+
+# 判断已有棋子的点时不能改动棋盘：曾经会移除该点的棋子
+def testForbiddenKeepsOccupiedPoint():
+    board = renjuBoard([(BLACK_CHESSMAN, 7, 7), (WHITE_CHESSMAN, 8, 8)])
+    hashBefore = board.hash
+    assert not board.isForbidden(BLACK_CHESSMAN, Point(8, 8))
+    assert not board.isForbidden(BLACK_CHESSMAN, Point(7, 7))
+    assert board.bits.get(8, 8) == WHITE_CHESSMAN.Value
+    assert board.bits.get(7, 7) == BLACK_CHESSMAN.Value
+    assert board.hash == hashBefore
+
+# 标准规则下长连不算获胜，无禁手规则下算获胜
+def testOverlineWins():
+    stones = [(x, 7) for x in (2, 3, 4, 6, 7)]
+    for name, wins in (("freestyle", True), ("standard", False)):
+        board = Board(15, createRule(name))
+        for x, y in stones:
+            board.makeMove(Point(x, y), BLACK_CHESSMAN.Value)
+        assert (board.dropChess(BLACK_CHESSMAN, Point(5, 7)) is BLACK_CHESSMAN) == wins
+
+if __name__ == "__main__":
+    for test in (testRenjuForbidden, testForbiddenKeepsOccupiedPoint, testOverlineWins):
+        test()
+    print("全部通过")
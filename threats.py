@@ -0,0 +1,244 @@
+#threats.py
+"""
+Created on Thu Oct 22 10:05:44 2026
+
+Description:威胁空间搜索。只沿冲四（连续冲四取胜，VCF）和冲四、活三（连续威胁取胜，VCT）
+展开，对手只考虑挡住威胁的点和反冲四，比全宽搜索窄得多，能在毫秒级找到必胜手段
+和必须防守的点。冲四、活三点在位棋盘上用移位与按位与一次求出
+"""
+from time import perf_counter
+from bitboard import DIRECTIONS
+from board import Point
+
+# 连珠形状：(己方棋子相对该点的偏移, 必须为空的点相对该点的偏移)，偏移以格为单位，
+# 该点本身必须为空。落子后成五的点：五格窗口中其余四格为己方棋子
+FIVE_PATTERNS = [([j - k for j in range(5) if j != k], [])
+                 for k in range(5)]
+# 落子后成四（再下一手可成五）的点：五格窗口中另有三格己方棋子和一格空位
+FOUR_PATTERNS = [([j - k for j in range(5) if j not in (k, gap)], [gap - k])
+                 for k in range(5) for gap in range(5) if gap != k]
+# 落子后成活三（再下一手可成活四）的点：六格窗口两端为空，中间四格中另有两格己方棋子和一格空位
+THREE_PATTERNS = [([j - k for j in range(1, 5) if j not in (k, gap)], [-k, 5 - k, gap - k])
+                  for k in range(1, 5) for gap in range(1, 5) if gap != k]
+
+# 超出节点数或时间预算时抛出，用于从递归中直接退出
+class ThreatTimeout(Exception):
+    pass
+
+# 位集合mask沿移位量shift平移steps格后的位集合：结果中某位为1表示原集合中
+# 该位偏移steps格处为1
+def _shifted(mask, shift, steps):
+    if steps >= 0:
+        return mask >> (steps * shift)
+    return mask << (-steps * shift)
+
+class ThreatSearch:
+    # bits为搜索所用的位棋盘（搜索结束后恢复原状），maxNodes、timeLimit为每次搜索的
+    # 节点数和时间（秒）预算，timeLimit为None时只限节点数，vcfDepth、vctDepth为进攻方
+    # 最多连续进攻的步数
+    def __init__(self, bits, maxNodes=1000, timeLimit=0.05, vcfDepth=10, vctDepth=6):
+        self._bits = bits
+        self._shifts = [dx + dy * bits.index(0, 1) for dx, dy in DIRECTIONS]
+        self._maxNodes = maxNodes
+        self._timeLimit = timeLimit
+        self._vcfDepth = vcfDepth
+        self._vctDepth = vctDepth
+        self._deadline = 0
+        self.nodes = 0 # 本次搜索的节点数
+
+    # 空位中符合patterns形状的点的位集合
+    def _matches(self, value, patterns):
+        bits = self._bits
+        own = bits.stones(value)
+        empty = bits.fullMask & ~(own | bits.stones(3 - value))
+        result = 0
+        for shift in self._shifts:
+            for ownSteps, emptySteps in patterns:
+                mask = empty
+                for step in ownSteps:
+                    mask &= _shifted(own, shift, step)
+                    if not mask:
+                        break
+                else:
+                    for step in emptySteps:
+                        mask &= _shifted(empty, shift, step)
+                    result |= mask
+        return result
+
+    # value方落子后成五的点
+    def fives(self, value):
+        return self._matches(value, FIVE_PATTERNS)
+
+    # value方落子后成四的点
+    def fours(self, value):
+        return self._matches(value, FOUR_PATTERNS)
+
+    # value方落子后成活三的点
+    def threes(self, value):
+        return self._matches(value, THREE_PATTERNS)
+
+    # 计数并检查预算
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self._maxNodes or perf_counter() > self._deadline:
+            raise ThreatTimeout()
+
+    # 连续冲四：attacker方先走，返回取胜的进攻落子序列，找不到时返回None
+    def _vcf(self, attacker, depth):
+        self._tick()
+        bits = self._bits
+        defender = 3 - attacker
+        five = self.fives(attacker)
+        if five:
+            return [Point(*bits.bitPoints(five & -five)[0])]
+        if depth == 0:
+            return None
+        threats = self.fives(defender)
+        if threats & (threats - 1): # 对手有两处成五，挡不住
+            return None
+        moves = self.fours(attacker)
+        if threats: # 必须先挡住对手成五的点
+            moves &= threats
+        for x, y in bits.bitPoints(moves):
+            bits.place(attacker, x, y)
+            try:
+                replies = self.fives(attacker)
+                if replies & (replies - 1): # 双四，对手只能挡一处
+                    return [Point(x, y)]
+                replyX, replyY = bits.bitPoints(replies)[0]
+                bits.place(defender, replyX, replyY) # 对手唯一的应对是挡住成五的点
+                try:
+                    if bits.isFive(defender, replyX, replyY): # 挡的同时成五
+                        continue
+                    line = self._vcf(attacker, depth - 1)
+                finally:
+                    bits.remove(replyX, replyY)
+            finally:
+                bits.remove(x, y)
+            if line is not None:
+                return [Point(x, y)] + line
+        return None
+
+    # 连续威胁：attacker方先走，每步冲四或活三，返回取胜的进攻落子序列的第一步，
+    # 找不到时返回None
+    def _vct(self, attacker, depth):
+        self._tick()
+        bits = self._bits
+        defender = 3 - attacker
+        five = self.fives(attacker)
+        if five:
+            return Point(*bits.bitPoints(five & -five)[0])
+        if depth == 0:
+            return None
+        threats = self.fives(defender)
+        if threats & (threats - 1):
+            return None
+        fours = self.fours(attacker)
+        threes = self.threes(attacker) & ~fours
+        if threats:
+            fours &= threats
+            threes &= threats
+        for x, y in bits.bitPoints(fours) + bits.bitPoints(threes): # 先冲四后活三
+            bits.place(attacker, x, y)
+            try:
+                won = self._defenceFails(attacker, depth)
+            finally:
+                bits.remove(x, y)
+            if won:
+                return Point(x, y)
+        return None
+
+    # attacker方刚形成威胁，轮到对手应对；对手的所有应对都挡不住时返回True
+    def _defenceFails(self, attacker, depth):
+        self._tick()
+        bits = self._bits
+        defender = 3 - attacker
+        if self.fives(defender): # 对手直接成五
+            return False
+        five = self.fives(attacker)
+        if five & (five - 1):
+            return True
+        if five: # 冲四只能挡
+            replies = five
+        else: # 活三可以挡在能成四的点上，也可以反冲四
+            replies = self.fours(attacker) | self.fours(defender)
+        for x, y in bits.bitPoints(replies):
+            bits.place(defender, x, y)
+            try:
+                won = self._vct(attacker, depth - 1) is not None
+            finally:
+                bits.remove(x, y)
+            if not won:
+                return False
+        return True
+
+    # value方的连续冲四取胜序列，找不到或超出预算时返回None
+    def findVCF(self, value):
+        for depth in range(1, self._vcfDepth + 1): # 迭代加深，优先找到最短的取胜序列
+            line = self._vcf(value, depth)
+            if line is not None:
+                return line
+        return None
+
+    # value方连续威胁取胜的第一步，找不到或超出预算时返回None
+    def findVCT(self, value):
+        for depth in range(1, self._vctDepth + 1):
+            point = self._vct(value, depth)
+            if point is not None:
+                return point
+        return None
+
+    # value方在威胁空间中的落子：直接成五、挡住对手成五、连续冲四取胜、
+    # 防守对手的连续冲四、连续威胁取胜，都没有时返回None
+    def bestMove(self, value):
+        bits = self._bits
+        rival = 3 - value
+        self.nodes = 0
+        five = self.fives(value)
+        if five:
+            return Point(*bits.bitPoints(five & -five)[0])
+        threats = self.fives(rival)
+        if threats:
+            return Point(*bits.bitPoints(threats & -threats)[0])
+        # 没有冲四点的一方不可能连续冲四，也没有活三点时不可能连续威胁，不必搜索
+        fours = self.fours(value)
+        threes = self.threes(value)
+        rivalFours = self.fours(rival)
+        if not (fours or threes or rivalFours):
+            return None
+        if self._timeLimit is None:
+            self._deadline = float("inf")
+        else:
+            self._deadline = perf_counter() + self._timeLimit
+        try:
+            if fours:
+                line = self.findVCF(value)
+                if line is not None:
+                    return line[0]
+            if rivalFours:
+                line = self.findVCF(rival)
+                if line is not None:
+                    return self._defendVCF(value, line)
+            if fours or threes:
+                return self.findVCT(value)
+            return None
+        except ThreatTimeout:
+            return None
+
+    # 对手有连续冲四取胜的序列line时，找一个落子后对手不再有连续冲四的点：
+    # 依次尝试序列中对手的进攻点和己方的冲四，都不行时返回None
+    def _defendVCF(self, value, line):
+        bits = self._bits
+        candidates = list(line)
+        for x, y in bits.bitPoints(self.fours(value)):
+            if Point(x, y) not in candidates:
+                candidates.append(Point(x, y))
+        for point in candidates:
+            bits.place(value, point.X, point.Y)
+            try:
+                refuted = self.findVCF(3 - value) is None
+            finally:
+                bits.remove(point.X, point.Y)
+            if refuted:
+                return point
+        return None
@@ -0,0 +1,70 @@
+#transposition.py
+"""
+Created on Sun Oct 18 16:05:12 2026
+
+Description:以Zobrist哈希值为键的置换表，用定长数组存储搜索过的局面，
+槽位冲突时保留搜索层数更深的结果
+"""
+from array import array
+
+# 分值的性质：精确值、下界（发生beta剪枝）、上界（所有点都不超过alpha）
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# 每个表项占用的字节数：哈希值8、层数1、性质1、分值8、最佳点2
+ENTRY_BYTES = 8 + 1 + 1 + 8 + 2
+
+class TranspositionTable:
+    # 初始化，memoryLimit为置换表占用内存的上限（字节）
+    def __init__(self, memoryLimit=16 * 1024 * 1024):
+        self.size = max(1, memoryLimit // ENTRY_BYTES) # 表项个数
+        self._keys = array("Q", [0]) * self.size
+        self._depths = array("b", [-1]) * self.size # -1表示空槽位
+        self._flags = array("B", [EXACT]) * self.size
+        self._scores = array("d", [0.0]) * self.size
+        self._moves = array("h", [-1]) * self.size # 最佳点的序号，-1表示无
+        self.hits = 0 # 命中次数
+        self.misses = 0 # 未命中次数
+        self.evictions = 0 # 覆盖其它局面的次数
+        self.stores = 0 # 写入次数
+
+    # 查询局面，命中时返回(层数, 性质, 分值, 最佳点序号)，否则返回None
+    def probe(self, key):
+        slot = key % self.size
+        if self._depths[slot] >= 0 and self._keys[slot] == key:
+            self.hits += 1
+            return (self._depths[slot], self._flags[slot],
+                    self._scores[slot], self._moves[slot])
+        self.misses += 1
+        return None
+
+    # 写入局面，槽位已被其它局面占用时只有层数不低于原表项才覆盖
+    def store(self, key, depth, flag, score, move=-1):
+        slot = key % self.size
+        storedDepth = self._depths[slot]
+        if storedDepth >= 0 and self._keys[slot] != key:
+            if depth < storedDepth: # 保留搜索更深的结果
+                return
+            self.evictions += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._flags[slot] = flag
+        self._scores[slot] = score
+        self._moves[slot] = move
+        self.stores += 1
+
+    # 清空置换表及统计数据
+    def clear(self):
+        self.__init__(self.size * ENTRY_BYTES)
+
+    # 返回统计数据
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": self.size,
+                "memory": self.size * ENTRY_BYTES,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stores": self.stores,
+                "hitRate": self.hits / lookups if lookups else 0.0}
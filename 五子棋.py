@@ -1,350 +1,714 @@
-#五子棋.py
-"""
-Created on Mon May 18 21:27:22 2020
-
-@author: Guocheng Lin
-@email: lgc0208@bupt.edu.cn
-
-Description:
-    主要通过python的pygame库，实现一款支持人机对战和人人对战的五子棋小游戏。
-在游戏初始界面会有5秒的规则介绍，五秒后自动进入人机对战模式。玩家可根据游戏中的提示
-按下Q键切换为初始人人对战对接，按下E键切换为初始人机对战界面。在游戏进行过程中，程
-序会记录并显示黑白两子的累计获胜局数，提高玩家体验。
-"""
-
-import pygame # 导入pygame库
-pygame.display.init() # 初始化
-import sys # 导入sys库
-import pygame.gfxdraw # pygame 不会自动导入 pygame.gfxdraw 模块
-# from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
-from board import Board, WHITE_CHESSMAN
-from machine import Machine, BLACK_CHESSMAN, Point
-# 从board.py目录引入相关类和变量
-from time import sleep
-
-
-POINT_NUMBER = 15 # 五子棋盘每行每列的点数
-POINT_SIZE = 30 # 棋盘中各个点的间隔
-INSIDE_WIDTH = 10 # 边框与棋盘的间距
-OUTSIDE_WIDTH = 30 # 边框与外部的间距
-BORDER_WIDTH = 5 # 边框的宽度（粗细）
-BORDER_LENGTH = POINT_SIZE * (POINT_NUMBER - 1) + 2 * INSIDE_WIDTH\
-                +BORDER_WIDTH*2 # 边界的长度=各点间隔*（点数-1）+
-                              # 2*边框与棋盘间距+边框宽度*2(不然下方和右方边框和棋盘宽度不够)
-BOARD_START_PLACE = OUTSIDE_WIDTH + BORDER_WIDTH + INSIDE_WIDTH
-                    # 棋盘的起始位置=外边界+边界宽+内边界
-
-SCREEN_HEIGHT = POINT_SIZE * (POINT_NUMBER - 1) + OUTSIDE_WIDTH * 2 + BORDER_WIDTH + INSIDE_WIDTH * 2  # 屏幕高度
-SCREEN_WIDTH = SCREEN_HEIGHT + 200  # 屏幕宽度
-
-ORANGE_COLOR = (255, 165, 0) # 橙色(棋盘)
-RED_COLOR = (200, 30, 30) # 红色(文字)
-BLUE_COLOR = (30, 30, 200) # 蓝色(文字)
-BLACK_COLOR = (0, 0, 0) # 黑色
-WHITE_COLOR = (255, 255, 255) # 白色
-
-PIECE_RADIUS_LEFT = POINT_SIZE//2 - 5 # 棋子的半径（左）
-PIECE_RADIUS_RIGHT = POINT_SIZE//2 + 5 # 棋子的半径（右）
-
-# 信息框文字起始位置
-INFORMATION_PLACE = SCREEN_HEIGHT + 2*PIECE_RADIUS_RIGHT + 10
-
-# 文字打印函数：在屏幕的(x,y)处打印文字，文字颜色默认为白色
-def printText(screen, font, x, y, text, textColor = (255, 255, 255)):
-    screenText = font.render(text, True, textColor) 
-                            # 文本显示方法，第一个参数为
-                            # 文本字符串，第二个参数为True时显示
-                            # 更平滑，第三个参数为文本颜色
-    screen.blit(screenText, (x, y)) # 在x，y处绘制需要显示的文字
-    
-# 棋盘的刻画
-def drawBoard(screen):
-    screen.fill(ORANGE_COLOR) # 填充背景色
-    # 绘制最外层的矩形框
-    pygame.draw.rect(screen, BLACK_COLOR, 
-                     ((OUTSIDE_WIDTH, OUTSIDE_WIDTH), 
-                      (BORDER_LENGTH,BORDER_LENGTH)), 
-                      BORDER_WIDTH)
-
-    # 绘制棋盘格子
-    # 绘制横线
-    for i in range(POINT_NUMBER):
-        # 绘制线条，第三、第四个参数为起止点
-        pygame.draw.line(screen, BLACK_COLOR, 
-                        (BOARD_START_PLACE,BOARD_START_PLACE + POINT_SIZE * i),
-                        (BOARD_START_PLACE + POINT_SIZE * (POINT_NUMBER - 1), 
-                         BOARD_START_PLACE + POINT_SIZE * i),
-                        1)
-    # 绘制竖线
-    for j in range(POINT_NUMBER):    
-        # 绘制线条，第三、第四个参数为起止点
-        pygame.draw.line(screen, BLACK_COLOR,
-                         (BOARD_START_PLACE + POINT_SIZE * j, BOARD_START_PLACE),
-                         (BOARD_START_PLACE + POINT_SIZE * j,
-                          BOARD_START_PLACE + POINT_SIZE * (POINT_NUMBER - 1)),
-                          1)
-    # 绘制天元及星位
-    for i in (3, 7, 11):
-        for j in (3, 7, 11):
-            if i == j :
-                if i == 7:
-                    radius = 3 # 天元
-                else:
-                    radius = 2 # 星位
-            # 绘制平滑的圆形边框
-            pygame.gfxdraw.aacircle(screen, 
-                                    BOARD_START_PLACE + POINT_SIZE * i,
-                                    BOARD_START_PLACE + POINT_SIZE * j,
-                                    radius, BLACK_COLOR)
-            # 绘制填充的圆形
-            pygame.gfxdraw.filled_circle(screen,
-                                         BOARD_START_PLACE + POINT_SIZE * i,
-                                         BOARD_START_PLACE + POINT_SIZE * j,
-                                         radius, BLACK_COLOR)
-
-# 绘制棋子
-def drawChess(screen, Point, pieceColor):
-    # 绘制平滑的圆形边框
-    pygame.gfxdraw.aacircle(screen, BOARD_START_PLACE + POINT_SIZE * Point.X,
-                            BOARD_START_PLACE + POINT_SIZE * Point.Y, 
-                            PIECE_RADIUS_LEFT, pieceColor)
-
-    pygame.gfxdraw.filled_circle(screen, BOARD_START_PLACE + POINT_SIZE * Point.X,
-                            BOARD_START_PLACE + POINT_SIZE * Point.Y, 
-                            PIECE_RADIUS_LEFT, pieceColor)
-
-# 绘制填充的圆形
-def drawChessInformation(screen, pos, color):
-    pygame.gfxdraw.aacircle(screen, pos[0], pos[1], PIECE_RADIUS_RIGHT, color)
-    pygame.gfxdraw.filled_circle(screen, pos[0], pos[1], PIECE_RADIUS_RIGHT, color)
-    
-# 下一个执子方
-def getNextRunner(currentRunner):
-    if currentRunner == BLACK_CHESSMAN: # 若黑方执子,返回白方
-        return WHITE_CHESSMAN
-    else: #若白方执子，返回黑方
-        return BLACK_CHESSMAN
-
-# 绘制信息栏
-def drawInfomation(screen, font, currentRunner, 
-                   SumOfBlackWin, SumOfWhiteWin):
-    # 绘制黑子
-    drawChess(screen, (SCREEN_HEIGHT + PIECE_RADIUS_RIGHT,
-                       BOARD_START_PLACE + PIECE_RADIUS_RIGHT),
-                        BLACK_CHESSMAN.pieceColor)
-    # 绘制白子
-    drawChess(screen, (SCREEN_HEIGHT + PIECE_RADIUS_RIGHT,
-                       BOARD_START_PLACE + PIECE_RADIUS_RIGHT),
-                        WHITE_CHESSMAN.pieceColor)
-    # 打印信息文字
-    printText(screen, font, INFORMATION_PLACE, BOARD_START_PLACE + 3,
-              "玩家1", BLUE_COLOR)
-    printText(screen, font, INFORMATION_PLACE, 
-              BOARD_START_PLACE + PIECE_RADIUS_RIGHT + 3,
-              "玩家2", BLUE_COLOR)
-
-# 获取鼠标点击位置，传入参数为pygame库获取的鼠标点击位置
-def getClick(clickPlace): 
-    placeX = clickPlace[0] - BOARD_START_PLACE # 点击的位置在棋盘中的横坐标
-    placeY = clickPlace[1] - BOARD_START_PLACE # 点击的位置在棋盘中的纵坐标
-    if placeX < -INSIDE_WIDTH or placeY < -INSIDE_WIDTH: # 若越界
-        return None
-    x = placeX // POINT_SIZE # 以棋子的大小为单位计算
-    y = placeY // POINT_SIZE
-    
-    # 修正点击位置，当用户点击位置与交点有偏差时自动修正
-    if placeX % POINT_SIZE > PIECE_RADIUS_LEFT: 
-        x += 1
-    if placeY % POINT_SIZE > PIECE_RADIUS_LEFT:
-        y += 1
-    if x >= POINT_NUMBER or y >= POINT_NUMBER: # 恰好在中间位置时不修正
-        return None
-    return Point(x, y) # 返回游戏区的坐标
-    
-# 主函数
-def main():
-    pygame.init() # 初始化pygame
-    # 根据定义的屏幕长宽，初始化准备显示的窗口
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    # 设置窗口标题
-    pygame.display.set_caption("五子棋_Python程序设计作业_林郭城_2019210471")
-    pygame.font.init()
-    font=pygame.font.SysFont("SimHei", 72) # 使用系统自带字体,否则显示会出现异常
-    fontSmall = pygame.font.SysFont("SimHei", 36)
-    fontSmallText = pygame.font.SysFont("SimHei", 18)
-    textWidth, textHeight = font.size("某方获胜") # 确定表示文本的空间
-     # 打印初始菜单
-    screen.fill(ORANGE_COLOR) # 填充背景色
-    printText(screen, fontSmall, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//4, 
-                      "游戏规则", BLACK_COLOR)
-    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//4+100, 
-                      "该五子棋游戏包括人人对战模式和人机对战模式", BLACK_COLOR)
-    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//4+130, 
-                      "若按下Q键切换为人人对战，按下E键切换为人机对战", BLACK_COLOR)
-    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//4+160, 
-                      "祝您游戏愉快！！！", BLACK_COLOR)
-    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//4+190, 
-                      "注：该屏幕五秒后自动消失", BLACK_COLOR)
-    pygame.display.flip() # 更新屏幕
-    sleep(5)
-              
-    
-    board = Board(POINT_NUMBER) # 创建棋盘对象
-    currentRunner = BLACK_CHESSMAN # 黑方先执子
-    winner = None # 胜者初始化
-    computer = Machine(POINT_NUMBER, WHITE_CHESSMAN) #AI#
-    
-    blackWinCount = 0
-    whiteWinCount = 0
-    
-    gameType = 1 # 游戏模式，默认为人机对战。0为人人，1为人机
-    while True:
-        for event in pygame.event.get(): # 监听用户事件
-            if event.type == pygame.QUIT: # 若用户点击'X'键
-                pygame.quit() # 否则点击退出键后程序会变成未响应
-                sys.exit() # 停止程序运行
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN: # 棋局结束后按下回车键重启游戏
-                    if winner is not None: # 当有胜者出现时
-                        winner = None # 重置胜者
-                        currentRunner = BLACK_CHESSMAN # 重置执子方
-                        board = Board(POINT_NUMBER) # 重置对象
-                        if gameType == 1:
-                            computer = Machine(POINT_NUMBER, WHITE_CHESSMAN) #重置电脑
-                if event.key == pygame.K_q: # Q键切换为人人模式
-                    gameType = 0
-                    winner = None # 重置胜者
-                    currentRunner = BLACK_CHESSMAN # 重置执子方
-                    board = Board(POINT_NUMBER) # 重置对象
-                if event.key == pygame.K_e: # E键切换为人机模式
-                    gameType = 1
-                    winner = None # 重置胜者
-                    currentRunner = BLACK_CHESSMAN # 重置执子方
-                    board = Board(POINT_NUMBER) # 重置对象
-                    computer = Machine(POINT_NUMBER, WHITE_CHESSMAN) #重置电脑
-            elif gameType == 1 and event.type == pygame.MOUSEBUTTONDOWN: # 人机模式下按下鼠标
-                if winner is None:
-                    pressArray = pygame.mouse.get_pressed() # 获取鼠标当前点击操作，返回一个三元组，分别对应左键、中键、右键
-                    if pressArray[0] or pressArray[2]: # 若按下的是鼠标左键或右键
-                        clickPlace = pygame.mouse.get_pos() # 获取鼠标当前位置，返回值为元组类型(x, y)
-                        clickPoint = getClick(clickPlace) # 将获取的鼠标位置转换为棋盘上的坐标位置
-                        if clickPoint is not None: # 若点击的位置在棋盘上
-                            if board.ifDropChess(clickPoint): # 判断鼠标单击位置是否可以落子
-                                winner = board.dropChess(currentRunner, clickPoint) # 判断落子后是否获胜
-                                if winner is None: # 若还未出现胜者
-                                    currentRunner = getNextRunner(currentRunner) # 交换执子方
-                                    computer.getRivalDrop(clickPoint) # 电脑获取玩家落子
-                                    machinePoint = computer.machineDrop() # 电脑落子
-                                    winner = board.dropChess(currentRunner, machinePoint) # 判断电脑落子后是否获胜
-                                    if winner is not None: # 若有胜者
-                                        whiteWinCount += 1 
-                                    currentRunner = getNextRunner(currentRunner)
-                                else:
-                                    blackWinCount += 1 # 胜利局数
-                            else:
-                                print("您点击的位置已有棋子")
-                        else:
-                            print("您点击的位置超出了棋盘区域")
-            elif gameType == 0 and event.type == pygame.MOUSEBUTTONDOWN: # 人人模式下按下鼠标
-                if winner is None:
-                    pressArray = pygame.mouse.get_pressed() # 获取鼠标当前点击操作，返回一个三元组，分别对应左键、中键、右键
-                    if pressArray[0] or pressArray[2]: # 若按下的是鼠标左键或右键
-                        clickPlace = pygame.mouse.get_pos() # 获取鼠标当前位置，返回值为元组类型(x, y)
-                        clickPoint = getClick(clickPlace) # 将获取的鼠标位置转换为棋盘上的坐标位置
-                        if clickPoint is not None: # 若点击的位置在棋盘上
-                            if board.ifDropChess(clickPoint): # 判断鼠标单击位置是否可以落子
-                                winner = board.dropChess(currentRunner, clickPoint) # 判断落子后是否获胜
-                                # 交换执子方
-                                if currentRunner == BLACK_CHESSMAN: 
-                                    currentRunner = WHITE_CHESSMAN
-                                else:
-                                    currentRunner = BLACK_CHESSMAN
-                                if winner is not None: # 若有胜者
-                                    if winner is WHITE_CHESSMAN:
-                                        whiteWinCount += 1 
-                                    elif winner is BLACK_CHESSMAN:
-                                        blackWinCount += 1 # 胜利局数
-                            else:
-                                print("您点击的位置已有棋子")
-                        else:
-                            print("您点击的位置超出了棋盘区域")
-        
-        drawBoard(screen) # 绘制棋盘
-        
-        for y, row in enumerate(board.board): # 按行遍历数组化的棋盘
-            for x, column in enumerate(row): # 遍历棋盘中每个点对应数组的元素
-                if column == BLACK_CHESSMAN.Value: # 若x列对应的值为黑子，则画黑子
-                    drawChess(screen, Point(x, y), BLACK_CHESSMAN.Color)
-                elif column == WHITE_CHESSMAN.Value: # 若是白子，则画白子
-                    drawChess(screen, Point(x, y), WHITE_CHESSMAN.Color)
-        if gameType == 1:
-            printText(screen, fontSmallText, SCREEN_WIDTH - 220,
-                      SCREEN_HEIGHT - 130, 
-                      "您正在进行的是：人机对战", BLACK_COLOR)
-            printText(screen, fontSmallText, SCREEN_WIDTH - 220,
-                      SCREEN_HEIGHT - 110, 
-                      "按下Q键可切换为人人对战", BLACK_COLOR)
-        elif gameType == 0:
-            printText(screen, fontSmallText, SCREEN_WIDTH - 220,
-                      SCREEN_HEIGHT - 130, 
-                      "您正在进行的是：人人对战", BLACK_COLOR)
-            printText(screen, fontSmallText, SCREEN_WIDTH - 220,
-                      SCREEN_HEIGHT - 110, 
-                      "按下E键可切换为人机对战", BLACK_COLOR)
-        # 画信息栏中的黑白子
-        drawChessInformation(screen, (SCREEN_WIDTH - PIECE_RADIUS_RIGHT - 160, 
-                                      BOARD_START_PLACE + 20), BLACK_COLOR)
-        drawChessInformation(screen, (SCREEN_WIDTH - PIECE_RADIUS_RIGHT - 160, 
-                                      BOARD_START_PLACE + 20 + PIECE_RADIUS_RIGHT*3), WHITE_COLOR)
-        # 刻画胜利局数
-        printText(screen, fontSmallText, SCREEN_WIDTH - 200,
-                      SCREEN_HEIGHT - 80, 
-                      "黑子获胜局数："+str(blackWinCount), BLACK_COLOR)
-        printText(screen, fontSmallText, SCREEN_WIDTH - 200,
-                      SCREEN_HEIGHT - 50, 
-                      "白子获胜局数："+str(whiteWinCount), BLACK_COLOR)
-        if winner:
-            # 在屏幕中央显示获胜和开始新一轮游戏的方法
-            printText(screen, font, (SCREEN_WIDTH - textWidth)//2,
-                      (SCREEN_HEIGHT - textHeight)//2, 
-                      winner.Name+"获胜", RED_COLOR)
-            printText(screen, fontSmall, 
-                      (SCREEN_WIDTH - textWidth)//2 - 0.25*textWidth,
-                      (SCREEN_HEIGHT - textHeight)//2 + textHeight*1.5, 
-                      "请按回车开始新一局游戏", RED_COLOR)         
-            # 在信息栏部分显示获胜
-            if winner == WHITE_CHESSMAN:
-                printText(screen, fontSmall, INFORMATION_PLACE,
-                          BOARD_START_PLACE + PIECE_RADIUS_RIGHT*3, 
-                          "获胜", BLUE_COLOR)
-            else:
-                printText(screen, fontSmall, INFORMATION_PLACE, BOARD_START_PLACE, 
-                          "获胜", BLUE_COLOR)
-        else: # 在信息栏部分显示当前落子状态
-            if gameType == 0:
-                if currentRunner == BLACK_CHESSMAN:
-                    printText(screen, fontSmall, INFORMATION_PLACE, BOARD_START_PLACE, 
-                          "落子中", BLUE_COLOR)
-                else:
-                    printText(screen, fontSmall, INFORMATION_PLACE,
-                          BOARD_START_PLACE + PIECE_RADIUS_RIGHT*3, 
-                          "落子中", BLUE_COLOR)
-            elif gameType == 1:
-                printText(screen, fontSmall, INFORMATION_PLACE, BOARD_START_PLACE, 
-                          "玩家", BLUE_COLOR)
-                printText(screen, fontSmall, INFORMATION_PLACE,
-                          BOARD_START_PLACE + PIECE_RADIUS_RIGHT*3, 
-                          "电脑", BLUE_COLOR)
-                
-           
-        pygame.display.flip() # 更新屏幕
-                        
-
-                    
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+#五子棋.py
+"""
+Created on Mon May 18 21:27:22 2020
+
+@author: Guocheng Lin
+@email: lgc0208@bupt.edu.cn
+
+Description:
+    主要通过python的pygame库，实现一款支持人机对战和人人对战的五子棋小游戏。
+在游戏初始界面会有规则介绍，按任意键或五秒后自动进入人机对战模式。玩家可根据游戏中的提示
+按下Q键切换为初始人人对战对接，按下E键切换为初始人机对战界面。在游戏进行过程中，程
+序会记录并显示黑白两子的累计获胜局数，提高玩家体验。
+"""
+
+import pygame # 导入pygame库，各子系统在main中按需初始化
+import os
+import sys # 导入sys库
+import pygame.gfxdraw # pygame 不会自动导入 pygame.gfxdraw 模块
+# from board import Board, BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+from board import Board, WHITE_CHESSMAN, DRAW
+from machine import BLACK_CHESSMAN, Point
+from engines import ENGINES, createEngine
+# 从board.py目录引入相关类和变量
+from record import RecordWriter, GameRecord, readRecords
+from instrumentation import Profiler
+from rules import RULES, createRule
+from time import perf_counter
+import argparse
+import logging
+import queue
+import threading
+
+
+POINT_NUMBER = 15 # 五子棋盘每行每列的点数
+POINT_SIZE = 30 # 棋盘中各个点的间隔
+INSIDE_WIDTH = 10 # 边框与棋盘的间距
+OUTSIDE_WIDTH = 30 # 边框与外部的间距
+BORDER_WIDTH = 5 # 边框的宽度（粗细）
+BOARD_START_PLACE = OUTSIDE_WIDTH + BORDER_WIDTH + INSIDE_WIDTH
+                    # 棋盘的起始位置=外边界+边界宽+内边界
+
+ORANGE_COLOR = (255, 165, 0) # 橙色(棋盘)
+RED_COLOR = (200, 30, 30) # 红色(文字)
+BLUE_COLOR = (30, 30, 200) # 蓝色(文字)
+BLACK_COLOR = (0, 0, 0) # 黑色
+WHITE_COLOR = (255, 255, 255) # 白色
+
+PIECE_RADIUS_LEFT = POINT_SIZE//2 - 5 # 棋子的半径（左）
+PIECE_RADIUS_RIGHT = POINT_SIZE//2 + 5 # 棋子的半径（右）
+
+# 按棋盘每行每列的点数计算随之变化的界面尺寸
+def setPointNumber(pointNumber):
+    global POINT_NUMBER, BORDER_LENGTH, SCREEN_HEIGHT, SCREEN_WIDTH, INFORMATION_PLACE
+    POINT_NUMBER = pointNumber
+    BORDER_LENGTH = POINT_SIZE * (POINT_NUMBER - 1) + 2 * INSIDE_WIDTH\
+                    +BORDER_WIDTH*2 # 边界的长度=各点间隔*（点数-1）+
+                                  # 2*边框与棋盘间距+边框宽度*2(不然下方和右方边框和棋盘宽度不够)
+    SCREEN_HEIGHT = POINT_SIZE * (POINT_NUMBER - 1) + OUTSIDE_WIDTH * 2 + BORDER_WIDTH + INSIDE_WIDTH * 2  # 屏幕高度
+    SCREEN_WIDTH = SCREEN_HEIGHT + 200  # 屏幕宽度
+    # 信息框文字起始位置
+    INFORMATION_PLACE = SCREEN_HEIGHT + 2*PIECE_RADIUS_RIGHT + 10
+
+setPointNumber(POINT_NUMBER)
+
+# 星位所在的行（列）：离边第四线（小棋盘为第三线）及中线，15路棋盘为3、7、11
+def getStarLines(pointNumber):
+    if pointNumber < 7:
+        return [pointNumber // 2]
+    edge = 3 if pointNumber >= 13 else 2
+    return [edge, pointNumber // 2, pointNumber - 1 - edge]
+
+FPS = 30 # 界面刷新的帧率上限
+RULES_SECONDS = 5 # 无操作时规则界面自动消失前显示的秒数
+
+FONT_NAME = "SimHei" # 使用系统自带字体,否则显示会出现异常
+# 记录查找到的字体文件路径，之后启动时不再扫描系统字体；删除该文件可重新查找
+FONT_CACHE = os.path.join(os.path.expanduser("~"), ".gobang_font")
+
+logger = logging.getLogger(__name__)
+
+# 文字打印函数：在屏幕的(x,y)处打印文字，文字颜色默认为白色
+def printText(screen, font, x, y, text, textColor = (255, 255, 255)):
+    screenText = font.render(text, True, textColor) 
+                            # 文本显示方法，第一个参数为
+                            # 文本字符串，第二个参数为True时显示
+                            # 更平滑，第三个参数为文本颜色
+    screen.blit(screenText, (x, y)) # 在x，y处绘制需要显示的文字
+    
+# 返回字体文件的路径，系统中没有该字体时返回None（使用pygame的默认字体）。
+# 扫描系统字体较慢，结果记录在FONT_CACHE中，记录的文件已不存在时重新扫描
+def findFont():
+    try:
+        with open(FONT_CACHE, encoding="utf-8") as cacheFile:
+            path = cacheFile.read().strip()
+        if not path or os.path.exists(path):
+            return path or None
+    except OSError:
+        pass
+    path = pygame.font.match_font(FONT_NAME)
+    try:
+        with open(FONT_CACHE, "w", encoding="utf-8") as cacheFile:
+            cacheFile.write(path or "")
+    except OSError: # 无法写入时下次启动重新扫描
+        pass
+    return path
+
+# 等待规则界面消失：按任意键或点击鼠标后返回，无操作时seconds秒后自动返回，等待期间照常响应关闭窗口
+def waitRules(fps, seconds):
+    clock = pygame.time.Clock()
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                return
+        clock.tick(fps)
+
+# 棋盘的刻画
+def drawBoard(screen):
+    screen.fill(ORANGE_COLOR) # 填充背景色
+    # 绘制最外层的矩形框
+    pygame.draw.rect(screen, BLACK_COLOR, 
+                     ((OUTSIDE_WIDTH, OUTSIDE_WIDTH), 
+                      (BORDER_LENGTH,BORDER_LENGTH)), 
+                      BORDER_WIDTH)
+
+    # 绘制棋盘格子
+    # 绘制横线
+    for i in range(POINT_NUMBER):
+        # 绘制线条，第三、第四个参数为起止点
+        pygame.draw.line(screen, BLACK_COLOR, 
+                        (BOARD_START_PLACE,BOARD_START_PLACE + POINT_SIZE * i),
+                        (BOARD_START_PLACE + POINT_SIZE * (POINT_NUMBER - 1), 
+                         BOARD_START_PLACE + POINT_SIZE * i),
+                        1)
+    # 绘制竖线
+    for j in range(POINT_NUMBER):    
+        # 绘制线条，第三、第四个参数为起止点
+        pygame.draw.line(screen, BLACK_COLOR,
+                         (BOARD_START_PLACE + POINT_SIZE * j, BOARD_START_PLACE),
+                         (BOARD_START_PLACE + POINT_SIZE * j,
+                          BOARD_START_PLACE + POINT_SIZE * (POINT_NUMBER - 1)),
+                          1)
+    # 绘制天元及星位
+    starLines = getStarLines(POINT_NUMBER)
+    for i in starLines:
+        for j in starLines:
+            if i == j == POINT_NUMBER // 2:
+                radius = 3 # 天元
+            else:
+                radius = 2 # 星位
+            # 绘制平滑的圆形边框
+            pygame.gfxdraw.aacircle(screen, 
+                                    BOARD_START_PLACE + POINT_SIZE * i,
+                                    BOARD_START_PLACE + POINT_SIZE * j,
+                                    radius, BLACK_COLOR)
+            # 绘制填充的圆形
+            pygame.gfxdraw.filled_circle(screen,
+                                         BOARD_START_PLACE + POINT_SIZE * i,
+                                         BOARD_START_PLACE + POINT_SIZE * j,
+                                         radius, BLACK_COLOR)
+
+# 绘制棋子
+def drawChess(screen, Point, pieceColor):
+    # 绘制平滑的圆形边框
+    pygame.gfxdraw.aacircle(screen, BOARD_START_PLACE + POINT_SIZE * Point.X,
+                            BOARD_START_PLACE + POINT_SIZE * Point.Y, 
+                            PIECE_RADIUS_LEFT, pieceColor)
+
+    pygame.gfxdraw.filled_circle(screen, BOARD_START_PLACE + POINT_SIZE * Point.X,
+                            BOARD_START_PLACE + POINT_SIZE * Point.Y, 
+                            PIECE_RADIUS_LEFT, pieceColor)
+
+# 绘制填充的圆形
+def drawChessInformation(screen, pos, color):
+    pygame.gfxdraw.aacircle(screen, pos[0], pos[1], PIECE_RADIUS_RIGHT, color)
+    pygame.gfxdraw.filled_circle(screen, pos[0], pos[1], PIECE_RADIUS_RIGHT, color)
+    
+# 下一个执子方
+def getNextRunner(currentRunner):
+    if currentRunner == BLACK_CHESSMAN: # 若黑方执子,返回白方
+        return WHITE_CHESSMAN
+    else: #若白方执子，返回黑方
+        return BLACK_CHESSMAN
+
+# 绘制信息栏
+def drawInfomation(screen, font, currentRunner, 
+                   SumOfBlackWin, SumOfWhiteWin):
+    # 绘制黑子
+    drawChess(screen, (SCREEN_HEIGHT + PIECE_RADIUS_RIGHT,
+                       BOARD_START_PLACE + PIECE_RADIUS_RIGHT),
+                        BLACK_CHESSMAN.pieceColor)
+    # 绘制白子
+    drawChess(screen, (SCREEN_HEIGHT + PIECE_RADIUS_RIGHT,
+                       BOARD_START_PLACE + PIECE_RADIUS_RIGHT),
+                        WHITE_CHESSMAN.pieceColor)
+    # 打印信息文字
+    printText(screen, font, INFORMATION_PLACE, BOARD_START_PLACE + 3,
+              "玩家1", BLUE_COLOR)
+    printText(screen, font, INFORMATION_PLACE, 
+              BOARD_START_PLACE + PIECE_RADIUS_RIGHT + 3,
+              "玩家2", BLUE_COLOR)
+
+# 界面绘制：静态的棋盘只绘制一次并缓存，之后每帧只绘制新落下的棋子和变化的文字，
+# 并只刷新发生变化的区域；每帧结束时按帧率上限等待，空闲时不占满CPU
+class Renderer:
+    def __init__(self, screen, fps=FPS):
+        self._screen = screen
+        self._fps = fps
+        self._clock = pygame.time.Clock()
+        # 缓存的静态背景：棋盘及信息栏中的黑白子
+        self._background = pygame.Surface(screen.get_size())
+        drawBoard(self._background)
+        drawChessInformation(self._background, (SCREEN_WIDTH - PIECE_RADIUS_RIGHT - 160, 
+                                                BOARD_START_PLACE + 20), BLACK_COLOR)
+        drawChessInformation(self._background, (SCREEN_WIDTH - PIECE_RADIUS_RIGHT - 160, 
+                                                BOARD_START_PLACE + 20 + PIECE_RADIUS_RIGHT*3),
+                             WHITE_COLOR)
+        self._board = None # 当前绘制的棋盘对象
+        self._drawn = 0 # 已绘制棋子的位集合
+        self._texts = {} # 已绘制的文字：名称 -> ((文字, 颜色, x, y), 区域)
+        self._dirty = [] # 本帧需要刷新的区域
+
+    # 换了新棋盘时重绘背景
+    def _reset(self, board):
+        self._screen.blit(self._background, (0, 0))
+        self._board = board
+        self._drawn = 0
+        self._texts = {}
+        self._dirty = [self._screen.get_rect()]
+
+    # 绘制棋盘上新落下的棋子
+    def drawStones(self, board):
+        if board is not self._board:
+            self._reset(board)
+        bits = board.bits
+        stones = bits.stones(BLACK_CHESSMAN.Value) | bits.stones(WHITE_CHESSMAN.Value)
+        for x, y in bits.bitPoints(stones & ~self._drawn): # 只绘制新落下的棋子
+            if bits.get(x, y) == BLACK_CHESSMAN.Value:
+                drawChess(self._screen, Point(x, y), BLACK_CHESSMAN.Color)
+            else:
+                drawChess(self._screen, Point(x, y), WHITE_CHESSMAN.Color)
+            self._dirty.append(pygame.Rect(BOARD_START_PLACE + POINT_SIZE * x - PIECE_RADIUS_LEFT - 1,
+                                           BOARD_START_PLACE + POINT_SIZE * y - PIECE_RADIUS_LEFT - 1,
+                                           PIECE_RADIUS_LEFT * 2 + 3, PIECE_RADIUS_LEFT * 2 + 3))
+        self._drawn = stones
+
+    # 绘制名为key的文字，内容不变时不重绘；text为空时擦除。
+    # 擦除时用背景覆盖，棋盘上的文字（胜负提示）只在换新棋盘时擦除
+    def drawText(self, key, font, x, y, text, textColor):
+        old = self._texts.get(key)
+        if old is not None and old[0] == (text, textColor, x, y):
+            return
+        if old is not None: # 擦除原来的文字
+            self._screen.blit(self._background, old[1], old[1])
+            self._dirty.append(old[1])
+            del self._texts[key]
+        if text:
+            rect = self._screen.blit(font.render(text, True, textColor), (x, y))
+            self._texts[key] = ((text, textColor, x, y), rect)
+            self._dirty.append(rect)
+
+    # 刷新变化的区域，并按帧率上限等待
+    def update(self):
+        if self._dirty:
+            pygame.display.update(self._dirty)
+            self._dirty = []
+        self._clock.tick(self._fps)
+
+# 在后台线程中计算电脑落子，界面每帧从结果队列中取结果，计算期间界面照常响应。
+# 每次请求或取消都更换批次号，已取消的计算结果按批次号丢弃
+class MoveWorker:
+    def __init__(self):
+        self._results = queue.Queue() # (批次号, 落子点, 异常)
+        self._generation = 0 # 当前批次号
+        self._engine = None # 正在计算的引擎
+
+    # 是否正在计算
+    @property
+    def thinking(self):
+        return self._engine is not None
+
+    # 在后台开始计算：engine记录对手落子rivalPoint（电脑先行时为None）后落子
+    def request(self, engine, rivalPoint):
+        self._generation += 1
+        self._engine = engine
+        threading.Thread(target=self._run, args=(engine, rivalPoint, self._generation),
+                         daemon=True).start()
+
+    def _run(self, engine, rivalPoint, generation):
+        try:
+            if rivalPoint is not None:
+                engine.getRivalDrop(rivalPoint)
+            self._results.put((generation, engine.machineDrop(), None))
+        except Exception as error: # 交给界面线程抛出
+            self._results.put((generation, None, error))
+
+    # 取出计算完成的落子点，没有时返回None
+    def poll(self):
+        while True:
+            try:
+                generation, point, error = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation != self._generation: # 已取消的计算
+                continue
+            self._engine = None
+            if error is not None:
+                raise error
+            return point
+
+    # 取消正在进行的计算，引擎提供stop时让其提前结束
+    def cancel(self):
+        if self._engine is not None:
+            stop = getattr(self._engine, "stop", None)
+            if stop is not None:
+                stop()
+            self._engine = None
+        self._generation += 1
+
+# 棋谱回放：逐局读取棋谱文件中与界面棋盘大小相同的对局，逐步前进或后退
+class Replay:
+    # rule为回放时判断胜负的规则
+    def __init__(self, path, rule):
+        self._rule = rule
+        self._records = (record for record in readRecords(path)
+                         if record.Size == POINT_NUMBER)
+        self.record = None # 正在回放的棋谱
+        self.step = 0 # 已回放的步数
+        self.nextGame()
+
+    # 切换到下一局，没有下一局时返回False
+    def nextGame(self):
+        record = next(self._records, None)
+        if record is None:
+            return False
+        self.record = record
+        self.step = 0
+        return True
+
+    # 前进一步，返回该步的落子位置，已到最后一步时返回None
+    def forward(self):
+        if self.record is None or self.step >= len(self.record.Moves):
+            return None
+        self.step += 1
+        return self.record.Moves[self.step - 1]
+
+    # 后退一步
+    def back(self):
+        if self.step > 0:
+            self.step -= 1
+
+    # 重建回放到当前步数的棋盘，返回(棋盘, 胜者, 下一步的执子方)
+    def board(self):
+        board = Board(POINT_NUMBER, self._rule)
+        winner = None
+        currentRunner = BLACK_CHESSMAN
+        if self.record is not None:
+            for point in self.record.Moves[:self.step]:
+                winner = board.dropChess(currentRunner, point)
+                currentRunner = getNextRunner(currentRunner)
+        return board, winner, currentRunner
+
+# 获取鼠标点击位置，传入参数为pygame库获取的鼠标点击位置
+def getClick(clickPlace): 
+    placeX = clickPlace[0] - BOARD_START_PLACE # 点击的位置在棋盘中的横坐标
+    placeY = clickPlace[1] - BOARD_START_PLACE # 点击的位置在棋盘中的纵坐标
+    if placeX < -INSIDE_WIDTH or placeY < -INSIDE_WIDTH: # 若越界
+        return None
+    x = placeX // POINT_SIZE # 以棋子的大小为单位计算
+    y = placeY // POINT_SIZE
+    
+    # 修正点击位置，当用户点击位置与交点有偏差时自动修正
+    if placeX % POINT_SIZE > PIECE_RADIUS_LEFT: 
+        x += 1
+    if placeY % POINT_SIZE > PIECE_RADIUS_LEFT:
+        y += 1
+    if x >= POINT_NUMBER or y >= POINT_NUMBER: # 恰好在中间位置时不修正
+        return None
+    return Point(x, y) # 返回游戏区的坐标
+    
+# 性能统计浮层的文字，stats为Profiler记录的一步
+def profileLines(stats):
+    calls = stats["calls"]
+    lines = [f"上一步用时：{stats['seconds'] * 1000:.1f}ms",
+             f"方向评估：{calls.get('getDirectionScore', 0)}次",
+             f"权重更新：{calls.get('_updateScores', 0)}次",
+             f"威胁搜索节点：{stats['threatNodes']}"]
+    if "searchMove" in calls:
+        lines.append(f"搜索节点：{stats['nodes']}")
+        lines.append(f"置换表命中：{stats['tableHits']}/{stats['tableProbes']}")
+    return lines
+
+# 主函数
+# pointNumber为棋盘每行每列的点数，ruleName为规则名称（见rules.py），
+# computerChessMan为人机对战中电脑的执子，engineName为电脑使用的引擎（见engines.py），
+# engineOptions为引擎的其它构造参数
+def main(fps=FPS, book=None, recordPath=None, replayPath=None, profile=False,
+         pointNumber=POINT_NUMBER, ruleName="freestyle", computerChessMan=WHITE_CHESSMAN,
+         engineName="machine", engineOptions=None):
+    engineOptions = engineOptions or {}
+    setPointNumber(pointNumber)
+    gameRule = createRule(ruleName)
+    # 只初始化用到的显示和字体子系统
+    pygame.display.init()
+    pygame.font.init()
+    # 根据定义的屏幕长宽，初始化准备显示的窗口
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # 设置窗口标题
+    pygame.display.set_caption("五子棋_Python程序设计作业_林郭城_2019210471")
+    fontPath = findFont()
+    font = pygame.font.Font(fontPath, 72)
+    fontSmall = pygame.font.Font(fontPath, 36)
+    fontSmallText = pygame.font.Font(fontPath, 18)
+    textWidth, textHeight = font.size("某方获胜") # 确定表示文本的空间
+     # 打印初始菜单
+    screen.fill(ORANGE_COLOR) # 填充背景色
+    printText(screen, fontSmall, (SCREEN_WIDTH - textWidth)//2,
+                      (SCREEN_HEIGHT - textHeight)//4, 
+                      "游戏规则", BLACK_COLOR)
+    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
+                      (SCREEN_HEIGHT - textHeight)//4+100, 
+                      "该五子棋游戏包括人人对战模式和人机对战模式", BLACK_COLOR)
+    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
+                      (SCREEN_HEIGHT - textHeight)//4+130, 
+                      "若按下Q键切换为人人对战，按下E键切换为人机对战", BLACK_COLOR)
+    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
+                      (SCREEN_HEIGHT - textHeight)//4+160, 
+                      "祝您游戏愉快！！！", BLACK_COLOR)
+    printText(screen, fontSmallText, (SCREEN_WIDTH - textWidth)//2,
+                      (SCREEN_HEIGHT - textHeight)//4+190, 
+                      "注：按任意键开始，该屏幕五秒后自动消失", BLACK_COLOR)
+    pygame.display.flip() # 更新屏幕
+              
+    
+    board = Board(POINT_NUMBER, gameRule) # 创建棋盘对象
+    currentRunner = BLACK_CHESSMAN # 黑方先执子
+    winner = None # 胜者初始化
+    profiler = Profiler() if profile else None # 电脑落子的性能统计
+    
+    computer = None
+    
+    # 创建与界面共用当前棋盘的电脑，启用性能统计时为其加上计时；
+    # 引擎有进程池等资源时先关闭上一局的电脑
+    def createComputer():
+        close = getattr(computer, "close", None)
+        if close is not None:
+            close()
+        engine = createEngine(engineName, POINT_NUMBER, computerChessMan, book=book,
+                              rule=gameRule, board=board, **engineOptions)
+        if profiler is not None:
+            profiler.detachAll()
+            profiler.attach(engine)
+        return engine
+    
+    computer = createComputer() #AI#
+    
+    blackWinCount = 0
+    whiteWinCount = 0
+    
+    gameType = 1 # 游戏模式，默认为人机对战。0为人人，1为人机，2为棋谱回放
+    renderer = Renderer(screen, fps) # 只重绘变化部分的界面绘制
+    worker = MoveWorker() # 后台计算电脑落子
+    # 保存已结束对局的棋谱
+    recorder = RecordWriter(recordPath) if recordPath else None
+    recordedBoard = None # 已保存棋谱的棋盘
+    replay = None
+    if replayPath: # 指定了棋谱文件时从回放开始
+        replay = Replay(replayPath, gameRule)
+        gameType = 2
+        board, winner, currentRunner = replay.board()
+    waitRules(fps, RULES_SECONDS) # 电脑等已创建完毕，规则界面消失后即可开始
+    while True:
+        for event in pygame.event.get(): # 监听用户事件
+            if event.type == pygame.QUIT: # 若用户点击'X'键
+                pygame.quit() # 否则点击退出键后程序会变成未响应
+                sys.exit() # 停止程序运行
+            elif event.type == pygame.KEYDOWN:
+                # 重置棋盘前取消电脑正在进行的计算，旧的计算只在旧棋盘上进行
+                if event.key in (pygame.K_q, pygame.K_e) \
+                    or (event.key == pygame.K_r and replay is not None):
+                    worker.cancel()
+                if gameType == 2: # 回放模式下方向键或空格逐步回放，N键或回车键回放下一局
+                    if event.key in (pygame.K_RIGHT, pygame.K_SPACE):
+                        point = replay.forward()
+                        if point is not None:
+                            winner = board.dropChess(currentRunner, point)
+                            currentRunner = getNextRunner(currentRunner)
+                    elif event.key == pygame.K_LEFT: # 后退时重建棋盘
+                        replay.back()
+                        board, winner, currentRunner = replay.board()
+                    elif event.key in (pygame.K_n, pygame.K_RETURN):
+                        if replay.nextGame():
+                            board, winner, currentRunner = replay.board()
+                elif event.key == pygame.K_r and replay is not None: # R键回到棋谱回放
+                    gameType = 2
+                    board, winner, currentRunner = replay.board()
+                if event.key == pygame.K_RETURN and gameType != 2: # 棋局结束后按下回车键重启游戏
+                    if winner is not None: # 当有胜者出现时
+                        winner = None # 重置胜者
+                        currentRunner = BLACK_CHESSMAN # 重置执子方
+                        board = Board(POINT_NUMBER, gameRule) # 重置对象
+                        if gameType == 1:
+                            computer = createComputer() #重置电脑
+                if event.key == pygame.K_q: # Q键切换为人人模式
+                    gameType = 0
+                    winner = None # 重置胜者
+                    currentRunner = BLACK_CHESSMAN # 重置执子方
+                    board = Board(POINT_NUMBER, gameRule) # 重置对象
+                if event.key == pygame.K_e: # E键切换为人机模式
+                    gameType = 1
+                    winner = None # 重置胜者
+                    currentRunner = BLACK_CHESSMAN # 重置执子方
+                    board = Board(POINT_NUMBER, gameRule) # 重置对象
+                    computer = createComputer() #重置电脑
+            elif gameType == 1 and event.type == pygame.MOUSEBUTTONDOWN: # 人机模式下按下鼠标
+                # 轮到电脑或电脑计算期间不响应点击
+                if winner is None and currentRunner != computerChessMan and not worker.thinking:
+                    pressArray = pygame.mouse.get_pressed() # 获取鼠标当前点击操作，返回一个三元组，分别对应左键、中键、右键
+                    if pressArray[0] or pressArray[2]: # 若按下的是鼠标左键或右键
+                        clickPlace = pygame.mouse.get_pos() # 获取鼠标当前位置，返回值为元组类型(x, y)
+                        clickPoint = getClick(clickPlace) # 将获取的鼠标位置转换为棋盘上的坐标位置
+                        if clickPoint is not None: # 若点击的位置在棋盘上
+                            if not board.ifDropChess(clickPoint): # 判断鼠标单击位置是否可以落子
+                                logger.info("您点击的位置已有棋子")
+                            elif board.isForbidden(currentRunner, clickPoint):
+                                logger.info("您点击的位置是禁手")
+                            else:
+                                winner = board.dropChess(currentRunner, clickPoint) # 判断落子后是否获胜
+                                if winner is None: # 若还未出现胜者，交换执子方，轮到电脑落子
+                                    currentRunner = getNextRunner(currentRunner)
+                                elif winner is BLACK_CHESSMAN:
+                                    blackWinCount += 1 # 胜利局数
+                                elif winner is WHITE_CHESSMAN:
+                                    whiteWinCount += 1
+                        else:
+                            logger.info("您点击的位置超出了棋盘区域")
+            elif gameType == 0 and event.type == pygame.MOUSEBUTTONDOWN: # 人人模式下按下鼠标
+                if winner is None:
+                    pressArray = pygame.mouse.get_pressed() # 获取鼠标当前点击操作，返回一个三元组，分别对应左键、中键、右键
+                    if pressArray[0] or pressArray[2]: # 若按下的是鼠标左键或右键
+                        clickPlace = pygame.mouse.get_pos() # 获取鼠标当前位置，返回值为元组类型(x, y)
+                        clickPoint = getClick(clickPlace) # 将获取的鼠标位置转换为棋盘上的坐标位置
+                        if clickPoint is not None: # 若点击的位置在棋盘上
+                            if not board.ifDropChess(clickPoint): # 判断鼠标单击位置是否可以落子
+                                logger.info("您点击的位置已有棋子")
+                            elif board.isForbidden(currentRunner, clickPoint):
+                                logger.info("您点击的位置是禁手")
+                            else:
+                                winner = board.dropChess(currentRunner, clickPoint) # 判断落子后是否获胜
+                                # 交换执子方
+                                if currentRunner == BLACK_CHESSMAN: 
+                                    currentRunner = WHITE_CHESSMAN
+                                else:
+                                    currentRunner = BLACK_CHESSMAN
+                                if winner is not None: # 若有胜者
+                                    if winner is WHITE_CHESSMAN:
+                                        whiteWinCount += 1 
+                                    elif winner is BLACK_CHESSMAN:
+                                        blackWinCount += 1 # 胜利局数
+                        else:
+                            logger.info("您点击的位置超出了棋盘区域")
+        
+        if gameType == 1 and winner is None and currentRunner == computerChessMan \
+            and not worker.thinking: # 轮到电脑时在后台获取玩家落子并计算
+            # 计算期间共用的棋盘上有试探的棋子，开始计算前先画出已落下的棋子（包括玩家刚落的子）
+            renderer.drawStones(board)
+            if board.moves:
+                worker.request(computer, board.moves[-1])
+            else: # 电脑先行
+                worker.request(computer, None)
+        machinePoint = worker.poll() # 电脑计算完成的落子
+        if machinePoint is not None:
+            winner = board.dropChess(currentRunner, machinePoint) # 判断电脑落子后是否获胜
+            if winner is BLACK_CHESSMAN: # 若有胜者
+                blackWinCount += 1
+            elif winner is WHITE_CHESSMAN:
+                whiteWinCount += 1 
+            currentRunner = getNextRunner(currentRunner)
+        if recorder is not None and winner is not None and gameType != 2 \
+            and recordedBoard is not board: # 对局结束时保存棋谱
+            recorder.write(GameRecord(POINT_NUMBER, winner.Value, 0, board.moves))
+            recorder.flush()
+            recordedBoard = board
+
+        if not worker.thinking: # 电脑计算期间不绘制，已落下的棋子在开始计算前已画出
+            renderer.drawStones(board) # 绘制新落下的棋子
+        if gameType == 1:
+            renderer.drawText("mode", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 130, 
+                              "您正在进行的是：人机对战", BLACK_COLOR)
+            renderer.drawText("switch", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 110, 
+                              "按下Q键可切换为人人对战", BLACK_COLOR)
+        elif gameType == 0:
+            renderer.drawText("mode", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 130, 
+                              "您正在进行的是：人人对战", BLACK_COLOR)
+            renderer.drawText("switch", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 110, 
+                              "按下E键可切换为人机对战", BLACK_COLOR)
+        elif gameType == 2:
+            renderer.drawText("mode", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 130, 
+                              "您正在进行的是：棋谱回放", BLACK_COLOR)
+            renderer.drawText("switch", fontSmallText, SCREEN_WIDTH - 220,
+                              SCREEN_HEIGHT - 110, 
+                              "方向键逐步回放，N键换局", BLACK_COLOR)
+        if profiler is not None and profiler.last is not None: # 在信息栏显示上一步的性能统计
+            lines = profileLines(profiler.last)
+            for i in range(6):
+                renderer.drawText(f"profile{i}", fontSmallText, SCREEN_WIDTH - 220,
+                                  SCREEN_HEIGHT - 260 + 20*i,
+                                  lines[i] if i < len(lines) else "", BLACK_COLOR)
+        # 刻画胜利局数
+        renderer.drawText("blackWins", fontSmallText, SCREEN_WIDTH - 200,
+                          SCREEN_HEIGHT - 80, 
+                          "黑子获胜局数："+str(blackWinCount), BLACK_COLOR)
+        renderer.drawText("whiteWins", fontSmallText, SCREEN_WIDTH - 200,
+                          SCREEN_HEIGHT - 50, 
+                          "白子获胜局数："+str(whiteWinCount), BLACK_COLOR)
+        blackStatus = "" # 信息栏中黑方、白方旁边的文字
+        whiteStatus = ""
+        if winner: # 有胜者或和棋
+            # 在屏幕中央显示获胜（和棋）和开始新一轮游戏的方法
+            if winner is DRAW:
+                resultText = winner.Name
+            else:
+                resultText = winner.Name+"获胜"
+            renderer.drawText("winner", font, (SCREEN_WIDTH - textWidth)//2,
+                              (SCREEN_HEIGHT - textHeight)//2, 
+                              resultText, RED_COLOR)
+            if gameType == 2:
+                restartText = "请按N键回放下一局"
+            else:
+                restartText = "请按回车开始新一局游戏"
+            renderer.drawText("restart", fontSmall, 
+                              (SCREEN_WIDTH - textWidth)//2 - 0.25*textWidth,
+                              (SCREEN_HEIGHT - textHeight)//2 + textHeight*1.5, 
+                              restartText, RED_COLOR)         
+            # 在信息栏部分显示获胜
+            if winner is DRAW:
+                blackStatus = whiteStatus = "和棋"
+            elif winner == WHITE_CHESSMAN:
+                whiteStatus = "获胜"
+            else:
+                blackStatus = "获胜"
+        else: # 在信息栏部分显示当前落子状态
+            if gameType == 0:
+                if currentRunner == BLACK_CHESSMAN:
+                    blackStatus = "落子中"
+                else:
+                    whiteStatus = "落子中"
+            elif gameType == 2:
+                blackStatus = f"第{replay.step}步"
+            elif gameType == 1:
+                if worker.thinking:
+                    computerStatus = "思考中"
+                else:
+                    computerStatus = "电脑"
+                if computerChessMan == WHITE_CHESSMAN:
+                    blackStatus, whiteStatus = "玩家", computerStatus
+                else:
+                    blackStatus, whiteStatus = computerStatus, "玩家"
+        renderer.drawText("blackStatus", fontSmall, INFORMATION_PLACE, BOARD_START_PLACE, 
+                          blackStatus, BLUE_COLOR)
+        renderer.drawText("whiteStatus", fontSmall, INFORMATION_PLACE,
+                          BOARD_START_PLACE + PIECE_RADIUS_RIGHT*3, 
+                          whiteStatus, BLUE_COLOR)
+           
+        renderer.update() # 只刷新变化的区域，并限制帧率
+                        
+
+                    
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="五子棋")
+    parser.add_argument("--fps", type=int, default=FPS, help="界面刷新的帧率上限")
+    parser.add_argument("--book", help="电脑使用的开局库文件")
+    parser.add_argument("--record", help="追加保存已结束对局的棋谱文件")
+    parser.add_argument("--replay", help="回放的棋谱文件，按R键可从对战回到回放")
+    parser.add_argument("--size", type=int, default=POINT_NUMBER, help="棋盘每行每列的点数")
+    parser.add_argument("--rule", default="freestyle", choices=sorted(RULES),
+                        help="规则：freestyle无禁手，standard恰好五连，renju黑方有禁手")
+    parser.add_argument("--computer", default="white", choices=["black", "white"],
+                        help="人机对战中电脑的执子")
+    parser.add_argument("--engine", default="machine", choices=sorted(ENGINES),
+                        help="电脑使用的引擎")
+    parser.add_argument("--time-limit", type=float,
+                        help="search和mcts引擎每步的思考时间（秒），默认使用引擎的设置")
+    parser.add_argument("--workers", type=int,
+                        help="search和mcts引擎并行搜索的进程数，默认使用引擎的设置")
+    parser.add_argument("--profile", action="store_true",
+                        help="统计电脑每步的耗时和调用次数，显示在信息栏中")
+    parser.add_argument("--threat-nodes", type=int, default=0,
+                        help="电脑每步威胁空间搜索的节点数，0为不搜索")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="控制台日志级别，INFO时输出每步落子")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+    if args.computer == "black":
+        computerChessMan = BLACK_CHESSMAN
+    else:
+        computerChessMan = WHITE_CHESSMAN
+    engineOptions = {"threatNodes": args.threat_nodes}
+    if args.engine in ("search", "mcts"):
+        if args.time_limit is not None:
+            engineOptions["timeLimit"] = args.time_limit
+        if args.workers is not None:
+            engineOptions["workers"] = args.workers
+    main(args.fps, args.book, args.record, args.replay, args.profile,
+         args.size, args.rule, computerChessMan, args.engine, engineOptions)
\ No newline at end of file